@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,10 +8,55 @@ class Settings(BaseSettings):
 
     anthropic_api_key: str
     model_name: str = "claude-haiku-4-5-20251001"
+
+    # Anthropic client: HTTP pool, concurrency and rate limits (0 disables a limit)
+    anthropic_timeout: float = 30.0
+    anthropic_max_connections: int = 20
+    anthropic_max_keepalive_connections: int = 10
+    anthropic_max_concurrency: int = 8
+    anthropic_requests_per_minute: int = 50
+    anthropic_input_tokens_per_minute: int = 50_000
+    anthropic_output_tokens_per_minute: int = 10_000
+    anthropic_max_retries: int = 4
+    anthropic_retry_base_delay: float = 0.5
+    anthropic_retry_max_delay: float = 20.0
+    anthropic_queue_timeout: float = 60.0
+
     chroma_path: str = "./chroma_db"
+    # "float32" stores full vectors only; "int8"/"float16" add a compact first-pass index
+    embedding_storage: Literal["float32", "float16", "int8"] = "float32"
+    rescore_multiplier: int = 4
+    # Snapshot directory bulk-loaded on startup when the vector store is empty
+    snapshot_bootstrap_path: str = ""
     scraper_headless: bool = True
     scraper_timeout: int = 30
     max_reviews_per_product: int = 50
 
+    # Background refresh of stale products, ranked by staleness x /chat demand
+    refresh_enabled: bool = False
+    refresh_tick_seconds: float = 300.0
+    refresh_scrapes_per_hour: float = 12.0
+    refresh_min_age_hours: float = 6.0
+    refresh_max_age_hours: float = 168.0
+    refresh_min_demand: float = 1.0
+    refresh_demand_weight: float = 1.0
+    refresh_demand_half_life_hours: float = 24.0
+
+    # Pre-generated reply drafts for newly ingested reviews
+    drafts_enabled: bool = False
+    drafts_per_product: int = 10
+    draft_workers: int = 2
+    draft_queue_size: int = 200
+
+    # Multi-worker mode: shared embedding + Chroma process (empty = in-process)
+    store_service_address: str = ""
+    # Required in multi-worker mode; the IPC protocol unpickles what it receives.
+    store_service_authkey: str = ""
+    store_service_connect_timeout: float = 60.0
+    # uvicorn workers in front of the store service; the Anthropic limits above
+    # are deployment-wide and get split across these processes
+    api_workers: int = 1
+    store_metrics_port: int = 0
+
 
 settings = Settings()
@@ -1,11 +1,15 @@
 import logging
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import chat, products, scrape
-from app.services import embedder
+from app.config import settings
+from app.routers import admin, chat, drafts, metrics, products, scrape
+from app.services import drafts as reply_drafts
+from app.services import embedder, refresh, snapshot, store_service
+from app.services import metrics as request_metrics
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,12 +20,22 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Warm up ChromaDB collection and embedding model on startup."""
-    logger.info("Starting up — initializing ChromaDB and embedding model...")
-    embedder._get_collection()
-    embedder._get_model()
+    """Warm up ChromaDB collection and embedding model (or connect to the store service)."""
+    if store_service.is_remote():
+        logger.info("Starting up — connecting to store service...")
+        store_service.connect()
+    else:
+        logger.info("Starting up — initializing ChromaDB and embedding model...")
+        embedder._get_collection()
+        embedder._get_model()
+        snapshot.bootstrap_if_empty()
+        # With a store service, the scheduler runs there instead (single writer).
+        if settings.refresh_enabled:
+            refresh.start()
     logger.info("Startup complete.")
     yield
+    refresh.stop()
+    reply_drafts.shutdown()
     logger.info("Shutting down.")
 
 
@@ -45,6 +59,37 @@ app.add_middleware(
 app.include_router(scrape.router)
 app.include_router(chat.router)
 app.include_router(products.router)
+app.include_router(drafts.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+
+
+@app.middleware("http")
+async def record_request_timings(request: Request, call_next):
+    """
+    Record total latency per route and attach a Server-Timing header.
+
+    Unhandled errors are recorded as status 500 before propagating to the
+    server error handler.
+    """
+    timings = request_metrics.start_request_timings()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        request_metrics.REQUEST_SECONDS.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        ).observe(elapsed)
+
+    timings.append(("total", elapsed))
+    response.headers["Server-Timing"] = request_metrics.format_server_timing(timings)
+    return response
 
 
 @app.get("/health", tags=["health"])
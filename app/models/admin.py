@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class RefreshEntry(BaseModel):
+    product_id: str
+    product_name: str
+    url: str
+    last_scraped_at: datetime
+    age_hours: float
+    demand: float  # decayed /chat request count
+    score: float
+    due: bool
+
+
+class RefreshSchedule(BaseModel):
+    enabled: bool
+    scrapes_per_hour: float
+    entries: list[RefreshEntry]
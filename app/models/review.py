@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -17,3 +19,11 @@ class ProductInfo(BaseModel):
     product_id: str
     product_name: str
     review_count: int
+
+
+class ReplyDraft(BaseModel):
+    product_id: str
+    review_text: str
+    generated_reply: str
+    context_used: int
+    created_at: datetime
@@ -0,0 +1,21 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.admin import RefreshSchedule
+from app.services import refresh
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/refresh", response_model=RefreshSchedule)
+async def refresh_schedule():
+    """Show the background refresh ranking: staleness weighted by /chat demand."""
+    return RefreshSchedule(
+        enabled=settings.refresh_enabled,
+        scrapes_per_hour=settings.refresh_scrapes_per_hour,
+        entries=await run_in_threadpool(refresh.compute_schedule),
+    )
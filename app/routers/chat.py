@@ -2,13 +2,18 @@ import logging
 
 from anthropic import APIError, AuthenticationError
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.review import ReviewChatRequest, ReviewChatResponse
-from app.services import claude_client, embedder
+from app.services import catalog, claude_client, embedder, metrics
+from app.services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Identical (product_id, review_text) requests in flight share one RAG + Claude run.
+_inflight_replies = SingleFlight("chat")
+
 
 @router.post("", response_model=ReviewChatResponse)
 async def chat(request: ReviewChatRequest):
@@ -18,34 +23,79 @@ async def chat(request: ReviewChatRequest):
     1. Retrieve top-k semantically similar chunks from ChromaDB (product-scoped).
     2. Build prompt: system role + retrieved context + customer review.
     3. Call Claude API and return the generated reply.
+
+    Concurrent identical requests are coalesced and receive the same reply.
+    Reviews with a pre-generated draft are answered from it without calling Claude.
     """
     if not request.review_text.strip():
         raise HTTPException(status_code=400, detail="Yorum metni boş olamaz.")
 
+    # Every request counts toward refresh demand, including coalesced ones.
+    try:
+        await run_in_threadpool(catalog.record_chat, request.product_id)
+    except Exception:
+        logger.warning("Could not record demand for product %s", request.product_id, exc_info=True)
+
+    reply, context_used = await _inflight_replies.do(
+        (request.product_id, request.review_text),
+        lambda: _generate(request.product_id, request.review_text),
+    )
+
+    return ReviewChatResponse(
+        product_id=request.product_id,
+        review_text=request.review_text,
+        generated_reply=reply,
+        context_used=context_used,
+    )
+
+
+async def _generate(product_id: str, review_text: str) -> tuple[str, int]:
+    """
+    Run retrieval + generation; returns the reply and the number of context chunks.
+
+    Store and Claude calls block (and are IPC round-trips in multi-worker mode),
+    so they run in worker threads to keep the event loop serving other requests.
+    """
+    draft = await run_in_threadpool(catalog.get_draft, product_id, review_text)
+    metrics.CACHE_LOOKUPS.labels(cache="reply_drafts", result="hit" if draft else "miss").inc()
+    if draft is not None:
+        return draft["reply"], draft["context_used"]
+
     # Retrieve product metadata from ChromaDB
-    products = embedder.list_products()
+    with metrics.timed("product_lookup"):
+        products = await run_in_threadpool(embedder.list_products)
     product_meta = next(
-        (p for p in products if p["product_id"] == request.product_id), None
+        (p for p in products if p["product_id"] == product_id), None
     )
     if product_meta is None:
         raise HTTPException(
             status_code=404,
-            detail=f"'{request.product_id}' ID'li ürün bulunamadı. Önce /scrape endpoint'ini kullanın.",
+            detail=f"'{product_id}' ID'li ürün bulunamadı. Önce /scrape endpoint'ini kullanın.",
         )
 
-    context_chunks = embedder.search_context(
-        product_id=request.product_id,
-        query=request.review_text,
+    context_chunks = await run_in_threadpool(
+        embedder.search_context,
+        product_id=product_id,
+        query=review_text,
         top_k=5,
     )
 
     try:
-        reply = claude_client.generate_reply(
+        # generate_reply also blocks while queued for a Claude slot.
+        reply = await run_in_threadpool(
+            claude_client.generate_reply,
             product_name=product_meta["product_name"],
             category=product_meta.get("category", "Genel"),
-            review_text=request.review_text,
+            review_text=review_text,
             context_chunks=context_chunks,
         )
+    except claude_client.LLMBusyError as e:
+        logger.warning("Claude request not admitted: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="Claude API şu anda yoğun. Lütfen biraz sonra tekrar deneyin.",
+            headers={"Retry-After": "5"},
+        )
     except AuthenticationError:
         logger.error("Claude API authentication failed — check ANTHROPIC_API_KEY")
         raise HTTPException(
@@ -59,9 +109,4 @@ async def chat(request: ReviewChatRequest):
             detail=f"Claude API hatası: {e}",
         )
 
-    return ReviewChatResponse(
-        product_id=request.product_id,
-        review_text=request.review_text,
-        generated_reply=reply,
-        context_used=len(context_chunks),
-    )
+    return reply, len(context_chunks)
@@ -0,0 +1,35 @@
+import logging
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.models.review import ReplyDraft
+from app.services import catalog
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/drafts", tags=["drafts"])
+
+
+def _to_model(draft: dict) -> ReplyDraft:
+    return ReplyDraft(
+        product_id=draft["product_id"],
+        review_text=draft["review_text"],
+        generated_reply=draft["reply"],
+        context_used=draft["context_used"],
+        created_at=draft["created_at"],
+    )
+
+
+@router.get("/{product_id}", response_model=list[ReplyDraft])
+async def list_drafts(product_id: str, review_text: str | None = None):
+    """
+    Return pre-generated reply drafts for a product's newest reviews.
+
+    Pass `review_text` to fetch the draft for a single review (404 if none exists).
+    """
+    if review_text is not None:
+        draft = await run_in_threadpool(catalog.get_draft, product_id, review_text)
+        if draft is None:
+            raise HTTPException(status_code=404, detail="Bu yorum için hazır yanıt taslağı yok.")
+        return [_to_model(draft)]
+    return [_to_model(d) for d in await run_in_threadpool(catalog.get_drafts, product_id)]
@@ -0,0 +1,22 @@
+import os
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Expose Prometheus metrics in text exposition format.
+
+    Under multiple uvicorn workers (PROMETHEUS_MULTIPROC_DIR set), samples from
+    all worker processes are aggregated so any worker can answer the scrape.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
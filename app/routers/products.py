@@ -1,6 +1,7 @@
 import logging
 
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.review import ProductInfo
 from app.services import embedder
@@ -12,6 +13,10 @@ router = APIRouter(prefix="/products", tags=["products"])
 @router.get("", response_model=list[ProductInfo])
 async def list_products():
     """List all products that have been scraped and stored in ChromaDB."""
+    return await run_in_threadpool(_list_products)
+
+
+def _list_products() -> list[ProductInfo]:
     raw = embedder.list_products()
     results = []
     for p in raw:
@@ -1,9 +1,11 @@
 import logging
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.product import ScrapeRequest, ScrapeResponse
-from app.services import embedder, scraper
+from app.config import settings
+from app.services import catalog, drafts, embedder, metrics, scraper
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scrape", tags=["scrape"])
@@ -11,8 +13,12 @@ router = APIRouter(prefix="/scrape", tags=["scrape"])
 
 def _scrape_and_embed(url: str) -> ScrapeResponse:
     """Run scraper + embedder synchronously (runs in background task)."""
-    product = scraper.scrape_product(url)
-    count = embedder.upsert_product(product)
+    with metrics.QUEUE_DEPTH.labels(executor="scrape").track_inprogress():
+        product = scraper.scrape_product(url)
+        count = embedder.upsert_product(product)
+        catalog.record_scrape(product.product_id, product.product_name, product.category, url)
+    if settings.drafts_enabled:
+        drafts.schedule(product)
     return ScrapeResponse(
         product_id=product.product_id,
         product_name=product.product_name,
@@ -34,7 +40,7 @@ async def scrape_product(request: ScrapeRequest, background_tasks: BackgroundTas
         raise HTTPException(status_code=400, detail="Sadece Trendyol URL'leri desteklenmektedir.")
 
     try:
-        result = _scrape_and_embed(url)
+        result = await run_in_threadpool(_scrape_and_embed, url)
         return result
     except Exception as exc:
         logger.exception("Scrape failed for URL: %s", url)
@@ -0,0 +1,212 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.services.store_service import routed
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    product_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    url TEXT NOT NULL,
+    last_scraped_at REAL NOT NULL,
+    demand REAL NOT NULL DEFAULT 0,
+    demand_updated_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS drafts (
+    product_id TEXT NOT NULL,
+    review_text TEXT NOT NULL,
+    reply TEXT NOT NULL,
+    context_used INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (product_id, review_text)
+);
+
+CREATE TABLE IF NOT EXISTS draft_invalidations (
+    product_id TEXT PRIMARY KEY,
+    invalidated_at REAL NOT NULL
+);
+"""
+
+_db: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+
+def _get_db() -> sqlite3.Connection:
+    """Product catalog stored next to ChromaDB (one row per scraped product)."""
+    global _db
+    if _db is None:
+        Path(settings.chroma_path).mkdir(parents=True, exist_ok=True)
+        _db = sqlite3.connect(
+            Path(settings.chroma_path) / "catalog.sqlite3",
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        _db.row_factory = sqlite3.Row
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.executescript(_SCHEMA)
+    return _db
+
+
+def decayed_demand(demand: float, updated_at: float | None, now: float) -> float:
+    """Exponentially decay a /chat demand score to `now` (half-life from settings)."""
+    if not demand or updated_at is None:
+        return 0.0
+    half_life = settings.refresh_demand_half_life_hours * 3600
+    return demand * 0.5 ** (max(0.0, now - updated_at) / half_life)
+
+
+@routed(write=True)
+def record_scrape(
+    product_id: str, product_name: str, category: str, url: str, scraped_at: float | None = None
+) -> None:
+    """Insert or refresh a product's catalog row after a successful scrape."""
+    scraped_at = time.time() if scraped_at is None else scraped_at
+    with _db_lock:
+        _get_db().execute(
+            """
+            INSERT INTO products (product_id, product_name, category, url, last_scraped_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(product_id) DO UPDATE SET
+                product_name = excluded.product_name,
+                category = excluded.category,
+                url = excluded.url,
+                last_scraped_at = excluded.last_scraped_at
+            """,
+            (product_id, product_name, category, url, scraped_at),
+        )
+
+
+# Not a store write: demand counting must not queue behind embedding upserts.
+@routed()
+def record_chat(product_id: str, at: float | None = None) -> None:
+    """Count one /chat request toward a product's decayed demand score (best effort)."""
+    at = time.time() if at is None else at
+    with _db_lock:
+        db = _get_db()
+        row = db.execute(
+            "SELECT demand, demand_updated_at FROM products WHERE product_id = ?", (product_id,)
+        ).fetchone()
+        if row is None:
+            return
+        demand = decayed_demand(row["demand"], row["demand_updated_at"], at) + 1.0
+        db.execute(
+            "UPDATE products SET demand = ?, demand_updated_at = ? WHERE product_id = ?",
+            (demand, at, product_id),
+        )
+
+
+@routed()
+def list_entries() -> list[dict]:
+    """Return every catalog row as a plain dict."""
+    with _db_lock:
+        rows = _get_db().execute("SELECT * FROM products").fetchall()
+    return [dict(row) for row in rows]
+
+
+@routed(write=True)
+def save_draft(
+    product_id: str, review_text: str, reply: str, context_used: int, started_at: float
+) -> bool:
+    """
+    Store a pre-generated reply draft.
+
+    Args:
+        started_at: When generation began; drafts started before the product's
+            last context change are discarded as stale.
+
+    Returns:
+        True if the draft was stored.
+    """
+    with _db_lock:
+        db = _get_db()
+        row = db.execute(
+            "SELECT invalidated_at FROM draft_invalidations WHERE product_id = ?", (product_id,)
+        ).fetchone()
+        if row is not None and started_at < row["invalidated_at"]:
+            return False
+        db.execute(
+            """
+            INSERT OR REPLACE INTO drafts (product_id, review_text, reply, context_used, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (product_id, review_text, reply, context_used, time.time()),
+        )
+    return True
+
+
+@routed(write=True)
+def invalidate_drafts(product_id: str) -> None:
+    """Drop a product's drafts after its RAG context changed."""
+    with _db_lock:
+        db = _get_db()
+        db.execute("DELETE FROM drafts WHERE product_id = ?", (product_id,))
+        db.execute(
+            "INSERT OR REPLACE INTO draft_invalidations (product_id, invalidated_at) VALUES (?, ?)",
+            (product_id, time.time()),
+        )
+
+
+@routed()
+def get_drafts(product_id: str) -> list[dict]:
+    """Return all stored drafts for a product, newest first."""
+    with _db_lock:
+        rows = _get_db().execute(
+            "SELECT * FROM drafts WHERE product_id = ? ORDER BY created_at DESC", (product_id,)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+@routed()
+def get_draft(product_id: str, review_text: str) -> dict | None:
+    """Return the stored draft for one review, if any."""
+    with _db_lock:
+        row = _get_db().execute(
+            "SELECT * FROM drafts WHERE product_id = ? AND review_text = ?",
+            (product_id, review_text),
+        ).fetchone()
+    return dict(row) if row is not None else None
+
+
+_SNAPSHOT_TABLES = ("products", "drafts", "draft_invalidations")
+
+
+@routed()
+def export_catalog() -> dict[str, list[dict]]:
+    """Dump all catalog tables for a snapshot."""
+    with _db_lock:
+        db = _get_db()
+        return {
+            table: [dict(row) for row in db.execute(f"SELECT * FROM {table}").fetchall()]
+            for table in _SNAPSHOT_TABLES
+        }
+
+
+@routed(write=True)
+def import_catalog(data: dict[str, list[dict]]) -> None:
+    """Load a catalog dump, replacing rows with the same primary key."""
+    with _db_lock:
+        db = _get_db()
+        db.execute("BEGIN")
+        try:
+            for table in _SNAPSHOT_TABLES:
+                known = {col["name"] for col in db.execute(f"PRAGMA table_info({table})")}
+                for row in data.get(table, []):
+                    row = {k: v for k, v in row.items() if k in known}
+                    columns = ", ".join(row)
+                    placeholders = ", ".join("?" for _ in row)
+                    db.execute(
+                        f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+                        tuple(row.values()),
+                    )
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
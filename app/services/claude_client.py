@@ -1,25 +1,206 @@
 import logging
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import anthropic
+import httpx
 
 from app.config import settings
+from app.services import metrics
+from app.services.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+MAX_TOKENS = 512
+# Rough Turkish chars-per-token ratio, used only to reserve input-token budget
+# before the call; the reservation is reconciled with the real usage afterwards.
+_CHARS_PER_TOKEN = 3
+# Same set the SDK retries by default (plus every 5xx below), now under our deadline.
+_RETRYABLE_STATUS = {408, 409, 429}
+
 _client: anthropic.Anthropic | None = None
+_slots: threading.BoundedSemaphore | None = None
+_buckets: dict[str, TokenBucket] | None = None
+_init_lock = threading.Lock()
 
 _PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "system_prompt.txt"
 _SYSTEM_PROMPT_TEMPLATE = _PROMPT_PATH.read_text(encoding="utf-8")
 
 
+class LLMBusyError(RuntimeError):
+    """Raised when a request cannot be admitted to Claude within the queue timeout."""
+
+
 def _get_client() -> anthropic.Anthropic:
     global _client
     if _client is None:
-        _client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        # Retries are handled by _create_with_retries so they share the rate limiter.
+        _client = anthropic.Anthropic(
+            api_key=settings.anthropic_api_key,
+            timeout=settings.anthropic_timeout,
+            max_retries=0,
+            http_client=anthropic.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.anthropic_max_connections,
+                    max_keepalive_connections=settings.anthropic_max_keepalive_connections,
+                ),
+            ),
+        )
     return _client
 
 
+def _limit_shares() -> int:
+    """
+    Number of processes sharing the configured tier limits.
+
+    Each process enforces its own limiter, so in multi-worker mode every API
+    worker, plus the store service (which drafts replies after refreshes), gets
+    an equal share of the deployment-wide limits.
+    """
+    if not settings.store_service_address:
+        return 1
+    return max(1, settings.api_workers) + 1
+
+
+def _get_slots() -> threading.BoundedSemaphore | None:
+    global _slots
+    if _slots is None and settings.anthropic_max_concurrency > 0:
+        with _init_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(
+                    max(1, settings.anthropic_max_concurrency // _limit_shares())
+                )
+    return _slots
+
+
+def _get_buckets() -> dict[str, TokenBucket]:
+    global _buckets
+    if _buckets is None:
+        with _init_lock:
+            if _buckets is None:
+                limits = {
+                    "requests": settings.anthropic_requests_per_minute,
+                    "input_tokens": settings.anthropic_input_tokens_per_minute,
+                    "output_tokens": settings.anthropic_output_tokens_per_minute,
+                }
+                _buckets = {
+                    name: TokenBucket.per_minute(limit / _limit_shares())
+                    for name, limit in limits.items()
+                    if limit > 0
+                }
+    return _buckets
+
+
+def _remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+
+def _take(bucket_name: str, amount: float, deadline: float) -> None:
+    bucket = _get_buckets().get(bucket_name)
+    if bucket is None:
+        return
+    try:
+        bucket.acquire(amount, timeout=_remaining(deadline))
+    except TimeoutError as exc:
+        metrics.LLM_REJECTED.labels(reason=bucket_name).inc()
+        raise LLMBusyError(f"Claude {bucket_name} rate limit exhausted") from exc
+    finally:
+        metrics.LLM_RATE_LIMIT_AVAILABLE.labels(bucket=bucket_name).set(bucket.available)
+
+
+def _give_back(bucket_name: str, amount: float) -> None:
+    bucket = _get_buckets().get(bucket_name)
+    if bucket is not None:
+        bucket.credit(amount)
+
+
+@contextmanager
+def _admitted(estimated_input_tokens: int, deadline: float) -> Iterator[None]:
+    """Wait for a concurrency slot and token budget; callers queue here under load."""
+    slots = _get_slots()
+    queued_at = time.monotonic()
+    with metrics.QUEUE_DEPTH.labels(executor="llm_queue").track_inprogress():
+        if slots is not None and not slots.acquire(timeout=_remaining(deadline)):
+            metrics.LLM_REJECTED.labels(reason="concurrency").inc()
+            raise LLMBusyError("No Claude concurrency slot became free in time")
+    try:
+        _take("input_tokens", estimated_input_tokens, deadline)
+        try:
+            _take("output_tokens", MAX_TOKENS, deadline)
+        except LLMBusyError:
+            _give_back("input_tokens", estimated_input_tokens)
+            raise
+        metrics.LLM_QUEUE_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+        try:
+            yield
+        except Exception:
+            # Failed calls are not billed against the tier limits.
+            _give_back("input_tokens", estimated_input_tokens)
+            _give_back("output_tokens", MAX_TOKENS)
+            raise
+    finally:
+        if slots is not None:
+            slots.release()
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+    ceiling = min(settings.anthropic_retry_max_delay, settings.anthropic_retry_base_delay * 2**attempt)
+    delay = random.uniform(0, ceiling)
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
+
+
+def _retry_reason(exc: anthropic.APIError) -> str | None:
+    """Metric label for a retryable failure, or None if the error is final."""
+    if isinstance(exc, anthropic.APITimeoutError):
+        return "timeout"
+    if isinstance(exc, anthropic.APIConnectionError):
+        return "connection"
+    if isinstance(exc, anthropic.APIStatusError) and (
+        exc.status_code in _RETRYABLE_STATUS or exc.status_code >= 500
+    ):
+        return str(exc.status_code)
+    return None
+
+
+def _create_with_retries(deadline: float, **kwargs) -> anthropic.types.Message:
+    client = _get_client()
+    attempt = 0
+    while True:
+        _take("requests", 1, deadline)
+        try:
+            return client.messages.create(**kwargs)
+        except anthropic.APIError as exc:
+            reason = _retry_reason(exc)
+            if reason is None or attempt == settings.anthropic_max_retries:
+                raise
+            retry_after = (
+                exc.response.headers.get("retry-after")
+                if isinstance(exc, anthropic.APIStatusError)
+                else None
+            )
+            delay = _retry_delay(attempt, retry_after)
+            if delay > _remaining(deadline):
+                raise
+            metrics.LLM_RETRIES.labels(status=reason).inc()
+            logger.warning(
+                "Claude API call failed (%s), retrying in %.2fs (attempt %d/%d)",
+                reason,
+                delay,
+                attempt + 1,
+                settings.anthropic_max_retries,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
 def generate_reply(
     product_name: str,
     category: str,
@@ -29,6 +210,9 @@ def generate_reply(
     """
     Generate a customer service reply using Claude with RAG context.
 
+    Blocks while waiting for a concurrency slot and rate-limit budget, so call
+    it from a worker thread rather than the event loop.
+
     Args:
         product_name: Name of the reviewed product.
         category: Product category.
@@ -37,9 +221,10 @@ def generate_reply(
 
     Returns:
         Generated reply string.
-    """
-    client = _get_client()
 
+    Raises:
+        LLMBusyError: If the request could not be admitted within the queue timeout.
+    """
     retrieved_context = "\n\n".join(
         f"- {chunk}" for chunk in context_chunks
     ) if context_chunks else "Ek bağlam bulunamadı."
@@ -49,20 +234,31 @@ def generate_reply(
         category=category,
         retrieved_context=retrieved_context,
     )
+    user_content = f"Müşteri yorumu:\n{review_text}"
+    estimated_input_tokens = (len(system_prompt) + len(user_content)) // _CHARS_PER_TOKEN
 
-    message = client.messages.create(
-        model=settings.model_name,
-        max_tokens=512,
-        system=system_prompt,
-        messages=[
-            {
-                "role": "user",
-                "content": f"Müşteri yorumu:\n{review_text}",
-            }
-        ],
-    )
+    deadline = time.monotonic() + settings.anthropic_queue_timeout
+    with _admitted(estimated_input_tokens, deadline):
+        with metrics.timed("llm"), metrics.QUEUE_DEPTH.labels(executor="llm").track_inprogress():
+            message = _create_with_retries(
+                deadline,
+                model=settings.model_name,
+                max_tokens=MAX_TOKENS,
+                system=system_prompt,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": user_content,
+                    }
+                ],
+            )
+
+    _give_back("input_tokens", estimated_input_tokens - message.usage.input_tokens)
+    _give_back("output_tokens", MAX_TOKENS - message.usage.output_tokens)
 
     reply = message.content[0].text
+    metrics.LLM_TOKENS.labels(direction="input").inc(message.usage.input_tokens)
+    metrics.LLM_TOKENS.labels(direction="output").inc(message.usage.output_tokens)
     logger.info(
         "Generated reply for product '%s' | input_tokens=%d | output_tokens=%d",
         product_name,
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.services import catalog, claude_client, embedder, metrics
+from app.services.scraper import ScrapedProduct
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.draft_workers, thread_name_prefix="reply-draft"
+        )
+    return _executor
+
+
+def _generate_draft(product: ScrapedProduct, review_text: str) -> None:
+    global _pending
+    started_at = time.time()
+    try:
+        context_chunks = embedder.search_context(product.product_id, review_text, top_k=5)
+        reply = claude_client.generate_reply(
+            product_name=product.product_name,
+            category=product.category,
+            review_text=review_text,
+            context_chunks=context_chunks,
+        )
+        stored = catalog.save_draft(
+            product.product_id, review_text, reply, len(context_chunks), started_at
+        )
+        metrics.DRAFTS.labels(result="stored" if stored else "stale").inc()
+    except Exception:
+        logger.exception("Draft generation failed for product %s", product.product_id)
+        metrics.DRAFTS.labels(result="failed").inc()
+    finally:
+        with _pending_lock:
+            _pending -= 1
+        metrics.QUEUE_DEPTH.labels(executor="drafts").dec()
+
+
+def schedule(product: ScrapedProduct) -> int:
+    """
+    Queue draft replies for the newest reviews of a freshly ingested product.
+
+    Takes the first `drafts_per_product` reviews in scrape order (newest first on
+    Trendyol) that have no stored draft yet. Work beyond `draft_queue_size`
+    pending drafts is dropped rather than queued without bound.
+
+    Returns:
+        Number of drafts queued.
+    """
+    global _pending
+    drafted = {d["review_text"] for d in catalog.get_drafts(product.product_id)}
+    candidates = [r for r in product.reviews[: settings.drafts_per_product] if r not in drafted]
+
+    queued = 0
+    for review_text in candidates:
+        with _pending_lock:
+            if _pending >= settings.draft_queue_size:
+                metrics.DRAFTS.labels(result="dropped").inc(len(candidates) - queued)
+                logger.warning(
+                    "Draft queue full, dropped %d drafts for product %s",
+                    len(candidates) - queued,
+                    product.product_id,
+                )
+                break
+            _pending += 1
+        metrics.QUEUE_DEPTH.labels(executor="drafts").inc()
+        _get_executor().submit(_generate_draft, product, review_text)
+        queued += 1
+    return queued
+
+
+def shutdown() -> None:
+    """Stop accepting drafts and drop queued ones (running drafts finish)."""
+    global _executor, _pending
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    with _pending_lock:
+        _pending = 0
+    metrics.QUEUE_DEPTH.labels(executor="drafts").set(0)
@@ -2,11 +2,15 @@ import logging
 from pathlib import Path
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 from sentence_transformers import SentenceTransformer
 
 from app.config import settings
+from app.services import catalog, metrics
+from app.services.quantization import QuantizedIndex, rescore
 from app.services.scraper import ScrapedProduct
+from app.services.store_service import routed
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,7 @@ EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 _client = None
 _collection = None
 _model = None
+_index = None
 
 
 def _get_client() -> chromadb.PersistentClient:
@@ -47,12 +52,93 @@ def _get_model() -> SentenceTransformer:
     return _model
 
 
-def upsert_product(product: ScrapedProduct) -> int:
+def _get_index() -> QuantizedIndex | None:
+    """Quantized first-pass index, or None when storing full-precision vectors only."""
+    global _index
+    if _index is None and settings.embedding_storage != "float32":
+        _index = QuantizedIndex(
+            Path(settings.chroma_path) / "quantized", settings.embedding_storage
+        )
+    return _index
+
+
+def _index_upsert(
+    index: QuantizedIndex,
+    collection: chromadb.Collection,
+    product_id: str,
+    ids: list[str],
+    embeddings: np.ndarray,
+) -> None:
+    """
+    Add a product's just-written vectors to the quantized index.
+
+    A product without an index entry (e.g. stored before quantization was
+    enabled) is seeded with all of its vectors from ChromaDB, which already
+    include the new ones, so search never ranks only a partial set.
+    """
+    if not index.contains(product_id):
+        stored = collection.get(where={"product_id": product_id}, include=["embeddings"])
+        if stored["ids"]:
+            ids, embeddings = stored["ids"], np.asarray(stored["embeddings"], dtype=np.float32)
+    index.upsert(product_id, ids, embeddings)
+
+
+def _assign_ids(
+    collection: chromadb.Collection,
+    product_id: str,
+    documents: list[str],
+    metadatas: list[dict],
+) -> tuple[list[str], list[dict], list[str], dict[str, str]]:
+    """
+    Give each document its stable id, shared by full and incremental upserts.
+
+    A review keeps the id it is already stored under (matched by text); new
+    reviews get ids after the highest stored review index. Reviews are never
+    addressed by their position in a scrape, so a shifted review window cannot
+    overwrite or duplicate stored reviews. Repeated review texts are dropped.
+
+    Returns:
+        (documents, metadatas, ids, stored) where `stored` maps the product's
+        stored ids to their text.
+    """
+    existing = collection.get(where={"product_id": product_id}, include=["documents"])
+    stored = dict(zip(existing["ids"], existing["documents"]))
+    review_ids = {text: doc_id for doc_id, text in stored.items() if "_review_" in doc_id}
+    next_idx = 1 + max(
+        (int(doc_id.rsplit("_", 1)[1]) for doc_id in stored if "_review_" in doc_id),
+        default=-1,
+    )
+
+    kept_documents: list[str] = []
+    kept_metadatas: list[dict] = []
+    ids: list[str] = []
+    seen: set[str] = set()
+    for document, metadata in zip(documents, metadatas):
+        if metadata["type"] == "review":
+            if document in seen:
+                continue
+            seen.add(document)
+            if document not in review_ids:
+                review_ids[document] = f"{product_id}_review_{next_idx}"
+                next_idx += 1
+            doc_id = review_ids[document]
+        else:
+            doc_id = f"{product_id}_desc"
+        kept_documents.append(document)
+        kept_metadatas.append(metadata)
+        ids.append(doc_id)
+    return kept_documents, kept_metadatas, ids, stored
+
+
+@routed(write=True)
+def upsert_product(product: ScrapedProduct, incremental: bool = False) -> int:
     """
     Embed and store product context + reviews into ChromaDB.
 
     Args:
         product: Scraped product data.
+        incremental: Only embed documents not already stored for the product
+            (used by scheduled refreshes); existing reviews are kept.
 
     Returns:
         Number of documents upserted.
@@ -62,7 +148,6 @@ def upsert_product(product: ScrapedProduct) -> int:
 
     documents: list[str] = []
     metadatas: list[dict] = []
-    ids: list[str] = []
 
     # Store product description as context
     if product.description:
@@ -75,10 +160,9 @@ def upsert_product(product: ScrapedProduct) -> int:
                 "category": product.category,
             }
         )
-        ids.append(f"{product.product_id}_desc")
 
     # Store each review
-    for idx, review in enumerate(product.reviews):
+    for review in product.reviews:
         documents.append(review)
         metadatas.append(
             {
@@ -88,22 +172,48 @@ def upsert_product(product: ScrapedProduct) -> int:
                 "category": product.category,
             }
         )
-        ids.append(f"{product.product_id}_review_{idx}")
 
     if not documents:
         logger.warning("No documents to upsert for product %s", product.product_id)
         return 0
 
-    embeddings = model.encode(documents, show_progress_bar=False).tolist()
-    collection.upsert(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
+    documents, metadatas, ids, stored = _assign_ids(
+        collection, product.product_id, documents, metadatas
+    )
+    changed = [stored.get(doc_id) != document for doc_id, document in zip(ids, documents)]
+    if incremental:
+        documents = [d for d, c in zip(documents, changed) if c]
+        metadatas = [m for m, c in zip(metadatas, changed) if c]
+        ids = [i for i, c in zip(ids, changed) if c]
+        if not documents:
+            logger.info("No new documents for product %s", product.product_id)
+            return 0
+
+    # The encoder's NumPy array goes to Chroma as-is; no per-float Python list copy.
+    with metrics.timed("upsert_encode"):
+        embeddings = model.encode(documents, show_progress_bar=False)
+    with metrics.timed("upsert_write"):
+        collection.upsert(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
+        index = _get_index()
+        if index is not None:
+            _index_upsert(index, collection, product.product_id, ids, embeddings)
+    # Drafts are only stale when the product's RAG context actually changed;
+    # a re-scrape that rewrites identical documents keeps them.
+    if any(changed):
+        catalog.invalidate_drafts(product.product_id)
     logger.info("Upserted %d documents for product %s", len(documents), product.product_id)
     return len(documents)
 
 
+@routed()
 def search_context(product_id: str, query: str, top_k: int = 5) -> list[str]:
     """
     Retrieve the most relevant context chunks for a given review query.
 
+    With quantized storage enabled, candidates come from the compact index and
+    only the top `top_k * rescore_multiplier` are rescored with full-precision
+    vectors from ChromaDB.
+
     Args:
         product_id: Filter results to this product.
         query: The incoming customer review text.
@@ -115,18 +225,34 @@ def search_context(product_id: str, query: str, top_k: int = 5) -> list[str]:
     collection = _get_collection()
     model = _get_model()
 
-    query_embedding = model.encode([query], show_progress_bar=False).tolist()
-
-    results = collection.query(
-        query_embeddings=query_embedding,
-        n_results=top_k,
-        where={"product_id": product_id},
-    )
+    with metrics.timed("embed"):
+        query_embedding = model.encode([query], show_progress_bar=False)
+
+    index = _get_index()
+    if index is not None:
+        with metrics.timed("vector_query"):
+            candidate_ids = index.search(
+                product_id, query_embedding, top_k * settings.rescore_multiplier
+            )
+        # Products ingested before quantization was enabled fall through to Chroma.
+        if candidate_ids is not None:
+            with metrics.timed("rescore"):
+                candidates = collection.get(ids=candidate_ids, include=["embeddings", "documents"])
+                best = rescore(query_embedding, candidates["embeddings"], top_k)
+            return [candidates["documents"][i] for i in best]
+
+    with metrics.timed("vector_query"):
+        results = collection.query(
+            query_embeddings=query_embedding,
+            n_results=top_k,
+            where={"product_id": product_id},
+        )
 
     docs = results.get("documents", [[]])[0]
     return docs
 
 
+@routed()
 def list_products() -> list[dict]:
     """Return all unique products stored in ChromaDB."""
     collection = _get_collection()
@@ -144,8 +270,53 @@ def list_products() -> list[dict]:
     return list(seen.values())
 
 
+@routed()
 def get_product_review_count(product_id: str) -> int:
     """Count review documents for a specific product."""
     collection = _get_collection()
     results = collection.get(where={"$and": [{"product_id": product_id}, {"type": "review"}]})
     return len(results.get("ids", []))
+
+
+@routed()
+def count_documents() -> int:
+    """Total number of documents in the collection."""
+    return _get_collection().count()
+
+
+@routed()
+def export_records(offset: int, limit: int) -> dict:
+    """
+    Read a page of raw records for snapshotting.
+
+    Returns:
+        Dict with `ids`, `documents`, `metadatas` lists and a float32 `embeddings` array.
+    """
+    page = _get_collection().get(
+        offset=offset, limit=limit, include=["embeddings", "documents", "metadatas"]
+    )
+    return {
+        "ids": page["ids"],
+        "documents": page["documents"],
+        "metadatas": page["metadatas"],
+        "embeddings": np.asarray(page["embeddings"], dtype=np.float32),
+    }
+
+
+@routed(write=True)
+def import_records(
+    ids: list[str], embeddings: np.ndarray, documents: list[str], metadatas: list[dict]
+) -> int:
+    """Bulk-load precomputed records (no re-embedding); also fills the quantized index."""
+    if not ids:
+        return 0
+    collection = _get_collection()
+    collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+    index = _get_index()
+    if index is not None:
+        by_product: dict[str, list[int]] = {}
+        for row, meta in enumerate(metadatas):
+            by_product.setdefault(meta["product_id"], []).append(row)
+        for product_id, rows in by_product.items():
+            _index_upsert(index, collection, product_id, [ids[r] for r in rows], embeddings[rows])
+    return len(ids)
@@ -0,0 +1,111 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+REQUEST_SECONDS = Histogram(
+    "trendyol_http_request_duration_seconds",
+    "End-to-end HTTP request latency.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "trendyol_stage_duration_seconds",
+    "Latency of individual pipeline stages (product lookup, embed, vector query, LLM, scrape).",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "trendyol_llm_tokens",
+    "Claude tokens consumed, by direction.",
+    ["direction"],
+)
+CACHE_LOOKUPS = Counter(
+    "trendyol_cache_lookups",
+    "Cache lookups by cache name and result (hit/miss).",
+    ["cache", "result"],
+)
+QUEUE_DEPTH = Gauge(
+    "trendyol_executor_queue_depth",
+    "Work items currently queued or running, per executor.",
+    ["executor"],
+)
+
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "trendyol_llm_queue_wait_seconds",
+    "Time a Claude request waited for a concurrency slot and rate-limit budget.",
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_RATE_LIMIT_AVAILABLE = Gauge(
+    "trendyol_llm_rate_limit_available",
+    "Tokens currently left in each Claude rate-limit bucket.",
+    ["bucket"],
+)
+LLM_RETRIES = Counter(
+    "trendyol_llm_retries",
+    "Claude calls retried after a retryable status, connection error or timeout.",
+    ["status"],
+)
+LLM_REJECTED = Counter(
+    "trendyol_llm_rejected",
+    "Claude requests turned away after the queue timeout, by limiting resource.",
+    ["reason"],
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "trendyol_singleflight_calls",
+    "Calls into a single-flight group: 'leader' ran the work, 'coalesced' shared it.",
+    ["group", "result"],
+)
+REFRESHES = Counter(
+    "trendyol_refreshes",
+    "Scheduled product refreshes, by result.",
+    ["result"],
+)
+REFRESH_DUE = Gauge(
+    "trendyol_refresh_due_products",
+    "Products due for a scheduled refresh at the last scheduler cycle.",
+)
+DRAFTS = Counter(
+    "trendyol_reply_drafts",
+    "Background reply drafts, by result (stored/stale/failed/dropped).",
+    ["result"],
+)
+
+# Per-request list of (stage, seconds), filled by `timed` and rendered into the
+# Server-Timing header by the HTTP middleware. The list object is shared with
+# worker threads through context copies, so appends from there are visible.
+_server_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar(
+    "server_timings", default=None
+)
+
+
+def start_request_timings() -> list[tuple[str, float]]:
+    """Begin collecting stage timings for the current request."""
+    timings: list[tuple[str, float]] = []
+    _server_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Observe the duration of the wrapped block as a pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+        timings = _server_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def format_server_timing(timings: list[tuple[str, float]]) -> str:
+    """Render stage timings as a Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings)
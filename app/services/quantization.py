@@ -0,0 +1,125 @@
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+SUPPORTED_DTYPES = ("int8", "float16")
+
+
+@dataclass
+class _ProductVectors:
+    ids: list[str]
+    codes: np.ndarray  # (n, dim) int8 or float16, rows are L2-normalized before quantizing
+    scales: np.ndarray  # (n,) float32 dequantization scale per row (1.0 for float16)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compress L2-normalized vectors for first-pass cosine search.
+
+    int8 uses symmetric per-vector scaling (max |x| maps to 127); float16 is a plain cast.
+
+    Returns:
+        (codes, scales) where `codes[i] * scales[i]` approximates vector i.
+    """
+    vectors = _normalize(vectors)
+    if dtype == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales = np.maximum(scales, 1e-12).astype(np.float32)
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    raise ValueError(f"Unsupported quantization dtype: {dtype}")
+
+
+class QuantizedIndex:
+    """
+    Per-product compact vectors used as the first pass of `search_context`.
+
+    Each product's codes are persisted to `<root>/<product_id>.npz` and loaded on
+    first use, so only products that are actually queried occupy memory.
+    """
+
+    def __init__(self, root: Path, dtype: str):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        self.root = root
+        self.dtype = dtype
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._products: dict[str, _ProductVectors | None] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, product_id: str) -> Path:
+        return self.root / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', product_id)}.npz"
+
+    def _load(self, product_id: str) -> _ProductVectors | None:
+        if product_id not in self._products:
+            path = self._path(product_id)
+            entry = None
+            if path.exists():
+                with np.load(path) as data:
+                    entry = _ProductVectors(
+                        ids=data["ids"].tolist(), codes=data["codes"], scales=data["scales"]
+                    )
+            self._products[product_id] = entry
+        return self._products[product_id]
+
+    def contains(self, product_id: str) -> bool:
+        """True if the product already has quantized vectors."""
+        with self._lock:
+            return self._load(product_id) is not None
+
+    def upsert(self, product_id: str, ids: list[str], embeddings: np.ndarray) -> None:
+        """Insert or replace vectors for `ids` within a product."""
+        codes, scales = quantize(embeddings, self.dtype)
+        with self._lock:
+            current = self._load(product_id)
+            if current is not None:
+                new_rows = {doc_id: i for i, doc_id in enumerate(ids)}
+                keep = [i for i, doc_id in enumerate(current.ids) if doc_id not in new_rows]
+                ids = [current.ids[i] for i in keep] + list(ids)
+                codes = np.concatenate([current.codes[keep], codes])
+                scales = np.concatenate([current.scales[keep], scales])
+            entry = _ProductVectors(ids=list(ids), codes=codes, scales=scales)
+            np.savez(self._path(product_id), ids=np.array(entry.ids), codes=codes, scales=scales)
+            self._products[product_id] = entry
+
+    def search(self, product_id: str, query: np.ndarray, k: int) -> list[str] | None:
+        """
+        Approximate top-`k` ids by cosine similarity.
+
+        Returns:
+            Candidate ids best-first, or None if the product has no quantized vectors.
+        """
+        with self._lock:
+            entry = self._load(product_id)
+        if entry is None or not entry.ids:
+            return None
+        query = _normalize(query).reshape(-1)
+        scores = (entry.codes.astype(np.float32) @ query) * entry.scales
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [entry.ids[i] for i in top]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by loaded codes and scales."""
+        return sum(
+            e.codes.nbytes + e.scales.nbytes for e in self._products.values() if e is not None
+        )
+
+
+def rescore(query: np.ndarray, embeddings: np.ndarray, k: int) -> list[int]:
+    """Rank full-precision candidate `embeddings` by exact cosine; returns top-`k` row indices."""
+    scores = _normalize(embeddings) @ _normalize(query).reshape(-1)
+    return np.argsort(-scores)[:k].tolist()
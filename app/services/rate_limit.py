@@ -0,0 +1,85 @@
+import threading
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, refilled continuously at `rate` tokens per second.
+
+    The balance may go negative through `credit` with a negative amount, which
+    lets callers reconcile an estimate with the real cost after the fact.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float, **kwargs) -> "TokenBucket":
+        """Bucket allowing `limit` tokens per minute with a one-minute burst."""
+        return cls(rate=limit / 60.0, capacity=limit, **kwargs)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` tokens if available.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds to wait before retrying.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0, timeout: float | None = None) -> float:
+        """
+        Block until `amount` tokens are taken.
+
+        Returns:
+            Seconds spent waiting.
+
+        Raises:
+            TimeoutError: If the tokens cannot be obtained within `timeout` seconds.
+        """
+        start = self._clock()
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return self._clock() - start
+            if timeout is not None and self._clock() - start + wait > timeout:
+                raise TimeoutError(f"token bucket could not supply {amount} tokens in {timeout}s")
+            self._sleep(wait)
+
+    def credit(self, amount: float) -> None:
+        """Return (or, if negative, additionally charge) tokens."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
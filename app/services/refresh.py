@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+
+from app.config import settings
+from app.services import catalog, drafts, embedder, metrics, scraper
+from app.services.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_scheduler: "RefreshScheduler | None" = None
+
+
+def compute_schedule(now: float | None = None) -> list[dict]:
+    """
+    Rank catalog products for re-scraping.
+
+    score = hours since last scrape x (1 + demand_weight x decayed /chat demand).
+    A product is due once it is older than `refresh_min_age_hours` and either
+    has at least `refresh_min_demand` demand or is older than `refresh_max_age_hours`,
+    so cold products are only revisited rarely.
+
+    Returns:
+        Entries sorted with due products first, highest score first.
+    """
+    now = time.time() if now is None else now
+    entries = []
+    for row in catalog.list_entries():
+        age_hours = max(0.0, now - row["last_scraped_at"]) / 3600
+        demand = catalog.decayed_demand(row["demand"], row["demand_updated_at"], now)
+        due = age_hours >= settings.refresh_min_age_hours and (
+            demand >= settings.refresh_min_demand or age_hours >= settings.refresh_max_age_hours
+        )
+        entries.append(
+            {
+                "product_id": row["product_id"],
+                "product_name": row["product_name"],
+                "url": row["url"],
+                "last_scraped_at": row["last_scraped_at"],
+                "age_hours": round(age_hours, 2),
+                "demand": round(demand, 3),
+                "score": round(age_hours * (1 + settings.refresh_demand_weight * demand), 3),
+                "due": due,
+            }
+        )
+    entries.sort(key=lambda e: (e["due"], e["score"]), reverse=True)
+    return entries
+
+
+def refresh_product(url: str) -> int:
+    """Re-scrape a product and embed only its new documents; returns documents written."""
+    with metrics.QUEUE_DEPTH.labels(executor="refresh").track_inprogress():
+        product = scraper.scrape_product(url)
+        written = embedder.upsert_product(product, incremental=True)
+        catalog.record_scrape(product.product_id, product.product_name, product.category, url)
+    if written and settings.drafts_enabled:
+        drafts.schedule(product)
+    logger.info("Refreshed product %s: %d new documents", product.product_id, written)
+    return written
+
+
+class RefreshScheduler:
+    """Background thread re-scraping the most valuable stale products within a scrape budget."""
+
+    def __init__(self):
+        rate = settings.refresh_scrapes_per_hour / 3600
+        # Budget accrues continuously but at most one tick's worth is spent per cycle.
+        self._budget = TokenBucket(rate=rate, capacity=max(1.0, rate * settings.refresh_tick_seconds))
+        self._failed_at: dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+
+    def run_once(self, now: float | None = None) -> list[str]:
+        """Refresh due products in priority order until the budget runs out."""
+        now = time.time() if now is None else now
+        schedule = compute_schedule(now)
+        due = [e for e in schedule if e["due"]]
+        metrics.REFRESH_DUE.set(len(due))
+
+        refreshed: list[str] = []
+        retry_after = settings.refresh_min_age_hours * 3600
+        for entry in due:
+            if now - self._failed_at.get(entry["product_id"], float("-inf")) < retry_after:
+                continue
+            if self._budget.try_acquire(1) > 0:
+                break
+            try:
+                refresh_product(entry["url"])
+            except Exception:
+                logger.exception("Refresh failed for product %s", entry["product_id"])
+                self._failed_at[entry["product_id"]] = now
+                metrics.REFRESHES.labels(result="error").inc()
+                continue
+            self._failed_at.pop(entry["product_id"], None)
+            metrics.REFRESHES.labels(result="ok").inc()
+            refreshed.append(entry["product_id"])
+        return refreshed
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.refresh_tick_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Refresh cycle failed")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def uncatalogued_products() -> list[str]:
+    """
+    Ids of stored products without a catalog row.
+
+    These were ingested before the catalog existed. The vector store keeps no
+    product URL, so they cannot be refreshed until they are re-scraped once.
+    """
+    catalogued = {entry["product_id"] for entry in catalog.list_entries()}
+    return sorted(p["product_id"] for p in embedder.list_products() if p["product_id"] not in catalogued)
+
+
+def start() -> None:
+    """Start the process-wide refresh scheduler (run it in exactly one process)."""
+    global _scheduler
+    missing = uncatalogued_products()
+    if missing:
+        logger.warning(
+            "%d stored products have no catalog entry and will not be refreshed until "
+            "re-scraped once via /scrape: %s",
+            len(missing),
+            ", ".join(missing[:20]) + (" ..." if len(missing) > 20 else ""),
+        )
+    if _scheduler is None:
+        _scheduler = RefreshScheduler()
+        _scheduler.start()
+        logger.info(
+            "Refresh scheduler started: every %.0fs, %.1f scrapes/hour",
+            settings.refresh_tick_seconds,
+            settings.refresh_scrapes_per_hour,
+        )
+
+
+def stop() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
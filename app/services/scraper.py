@@ -14,6 +14,7 @@ from selenium_stealth import stealth
 from webdriver_manager.chrome import ChromeDriverManager
 
 from app.config import settings
+from app.services import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -196,15 +197,18 @@ def scrape_product(url: str) -> ScrapedProduct:
         ValueError: If the page cannot be loaded.
         RuntimeError: If required product data is missing.
     """
-    driver = _build_driver()
+    with metrics.timed("scrape_driver_start"):
+        driver = _build_driver()
     try:
-        driver.get(url)
-        wait = WebDriverWait(driver, settings.scraper_timeout)
+        with metrics.timed("scrape_product_page"):
+            driver.get(url)
+            wait = WebDriverWait(driver, settings.scraper_timeout)
 
-        product_id = _extract_product_id(url)
-        info = _scrape_product_info(driver, wait)
+            product_id = _extract_product_id(url)
+            info = _scrape_product_info(driver, wait)
 
-        reviews = _scrape_reviews(driver, url, wait)
+        with metrics.timed("scrape_reviews"):
+            reviews = _scrape_reviews(driver, url, wait)
         logger.info(
             "Scraped product '%s' (id=%s): %d reviews",
             info["product_name"],
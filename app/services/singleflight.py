@@ -0,0 +1,41 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.services import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key onto one in-flight computation.
+
+    The first caller for a key starts the work; callers arriving while it runs
+    await the same task and receive its result or exception. Nothing is cached
+    once the task finishes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            metrics.SINGLEFLIGHT_CALLS.labels(group=self.name, result="leader").inc()
+        else:
+            metrics.SINGLEFLIGHT_CALLS.labels(group=self.name, result="coalesced").inc()
+        # Shield so one disconnecting caller does not cancel the work for the others.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
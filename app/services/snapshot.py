@@ -0,0 +1,175 @@
+"""
+Portable snapshots of the vector store for fast replica bootstrapping.
+
+A snapshot is a directory containing:
+
+    manifest.json        format version, embedding model, counts, chunk checksums
+    chunk-00000.npz ...  compressed float32 embeddings + ids, documents, metadata
+    catalog.json.gz      product catalog and reply drafts
+
+Loading a snapshot upserts the stored vectors directly, so nothing is
+re-scraped or re-embedded. Usage:
+
+    python -m app.services.snapshot export ./snapshots/2026-10-19
+    python -m app.services.snapshot import ./snapshots/2026-10-19
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.services import catalog, embedder
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+_MANIFEST = "manifest.json"
+_CATALOG = "catalog.json.gz"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_snapshot(path: Path, chunk_size: int = 5000) -> dict:
+    """
+    Write the collection and catalog to `path` in chunks.
+
+    Args:
+        path: Target directory (created if missing, must not contain a snapshot).
+        chunk_size: Records per chunk file; keep below Chroma's max batch size.
+
+    Returns:
+        The written manifest.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    if (path / _MANIFEST).exists():
+        raise FileExistsError(f"{path} already contains a snapshot")
+
+    total = embedder.count_documents()
+    chunks = []
+    dimension = None
+    for offset in range(0, total, chunk_size):
+        page = embedder.export_records(offset, chunk_size)
+        if not page["ids"]:
+            break
+        dimension = page["embeddings"].shape[1]
+        name = f"chunk-{len(chunks):05d}.npz"
+        np.savez_compressed(
+            path / name,
+            ids=np.array(page["ids"]),
+            documents=np.array(page["documents"]),
+            metadatas=np.array([json.dumps(m, ensure_ascii=False) for m in page["metadatas"]]),
+            embeddings=page["embeddings"],
+        )
+        chunks.append({"file": name, "count": len(page["ids"]), "sha256": _sha256(path / name)})
+        logger.info("Exported %d/%d records", offset + len(page["ids"]), total)
+
+    with gzip.open(path / _CATALOG, "wt", encoding="utf-8") as f:
+        json.dump(catalog.export_catalog(), f, ensure_ascii=False)
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created_at": time.time(),
+        "embedding_model": embedder.EMBEDDING_MODEL,
+        "dimension": dimension,
+        "count": sum(c["count"] for c in chunks),
+        "chunks": chunks,
+        "catalog": _CATALOG,
+    }
+    # Written last: a directory without a manifest is an incomplete export.
+    (path / _MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logger.info("Snapshot written to %s (%d records, %d chunks)", path, manifest["count"], len(chunks))
+    return manifest
+
+
+def import_snapshot(path: Path) -> int:
+    """
+    Bulk-load a snapshot written by `export_snapshot`.
+
+    Returns:
+        Number of records loaded.
+
+    Raises:
+        ValueError: If the snapshot is incomplete, corrupted, or built with another
+            embedding model.
+    """
+    manifest_path = path / _MANIFEST
+    if not manifest_path.exists():
+        raise ValueError(f"{path} has no {_MANIFEST}; export may be incomplete")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest['format']}")
+    if manifest["embedding_model"] != embedder.EMBEDDING_MODEL:
+        raise ValueError(
+            f"Snapshot embeddings come from {manifest['embedding_model']}, "
+            f"this build uses {embedder.EMBEDDING_MODEL}"
+        )
+
+    loaded = 0
+    start = time.perf_counter()
+    for chunk in manifest["chunks"]:
+        chunk_path = path / chunk["file"]
+        if _sha256(chunk_path) != chunk["sha256"]:
+            raise ValueError(f"Checksum mismatch for {chunk_path}")
+        with np.load(chunk_path) as data:
+            loaded += embedder.import_records(
+                ids=data["ids"].tolist(),
+                embeddings=data["embeddings"],
+                documents=data["documents"].tolist(),
+                metadatas=[json.loads(m) for m in data["metadatas"]],
+            )
+        logger.info("Imported %d/%d records", loaded, manifest["count"])
+
+    with gzip.open(path / manifest["catalog"], "rt", encoding="utf-8") as f:
+        catalog.import_catalog(json.load(f))
+
+    logger.info("Snapshot %s loaded: %d records in %.1fs", path, loaded, time.perf_counter() - start)
+    return loaded
+
+
+def bootstrap_if_empty() -> int:
+    """Load `settings.snapshot_bootstrap_path` when the collection is still empty."""
+    if not settings.snapshot_bootstrap_path:
+        return 0
+    if embedder.count_documents() > 0:
+        logger.info("Vector store already populated, skipping snapshot bootstrap")
+        return 0
+    return import_snapshot(Path(settings.snapshot_bootstrap_path))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export or import a vector store snapshot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="Write a snapshot of the current store.")
+    export_cmd.add_argument("path", type=Path)
+    export_cmd.add_argument("--chunk-size", type=int, default=5000)
+    import_cmd = commands.add_parser("import", help="Bulk-load a snapshot into the store.")
+    import_cmd.add_argument("path", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_snapshot(args.path, chunk_size=args.chunk_size)
+    else:
+        import_snapshot(args.path)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+    sys.exit(main())
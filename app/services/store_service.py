@@ -0,0 +1,191 @@
+"""
+Shared embedding + vector store process for multi-worker deployments.
+
+When STORE_SERVICE_ADDRESS is set, functions decorated with `@routed` are not
+executed in the calling API worker. They are forwarded over local IPC to a
+single store process that owns the SentenceTransformer model and the Chroma
+PersistentClient. Reads run concurrently there, writes are serialized.
+
+Start the store process with:
+
+    python -m app.services.store_service
+
+The IPC protocol is pickle-based, so a client holding the authkey can run code
+in the store process. STORE_SERVICE_AUTHKEY must be set to a private secret,
+and the service should only listen on a Unix socket or a private address.
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.managers import BaseManager
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+_exported: dict[str, Callable] = {}
+_serving = False
+# Serializes writes made in the owning process, whether they arrive over IPC or
+# from local threads such as the refresh scheduler. Re-entrant so one write may
+# call another.
+_write_lock = threading.RLock()
+_proxy = None
+_proxy_lock = threading.Lock()
+_DEFAULT_ADDRESS = "127.0.0.1:50051"
+# Empty, or the key older READMEs shipped as the example default.
+_INSECURE_AUTHKEYS = {"", "trendyol-store"}
+
+
+class _ServerManager(BaseManager):
+    pass
+
+
+class _ClientManager(BaseManager):
+    pass
+
+
+_ClientManager.register("store")
+
+
+class _Store:
+    """Executes exported functions inside the store process."""
+
+    def call(self, name: str, args: tuple, kwargs: dict):
+        return _exported[name](*args, **kwargs)
+
+
+def _parse_address(value: str) -> tuple[str, int] | str:
+    """'host:port' becomes a TCP address; anything else is a Unix socket path."""
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return value
+
+
+def _authkey() -> bytes:
+    """The IPC authkey; refuses to run with an empty or publicly known key."""
+    if settings.store_service_authkey in _INSECURE_AUTHKEYS:
+        raise RuntimeError(
+            "STORE_SERVICE_AUTHKEY must be set to a private secret to use the store service"
+        )
+    return settings.store_service_authkey.encode("utf-8")
+
+
+def is_remote() -> bool:
+    """True when this process forwards routed calls to the store service."""
+    return bool(settings.store_service_address) and not _serving
+
+
+def connect(timeout: float | None = None):
+    """Connect to the store service, retrying until it accepts or `timeout` elapses."""
+    global _proxy
+    timeout = settings.store_service_connect_timeout if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    with _proxy_lock:
+        while _proxy is None:
+            manager = _ClientManager(
+                address=_parse_address(settings.store_service_address), authkey=_authkey()
+            )
+            try:
+                manager.connect()
+            except (ConnectionError, FileNotFoundError) as exc:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(
+                        f"Store service at {settings.store_service_address} is unreachable"
+                    ) from exc
+                time.sleep(0.5)
+                continue
+            _proxy = manager.store()
+            logger.info("Connected to store service at %s", settings.store_service_address)
+    return _proxy
+
+
+def _reset() -> None:
+    global _proxy
+    with _proxy_lock:
+        _proxy = None
+
+
+def routed(write: bool = False):
+    """
+    Mark a store function as executable in the shared store process.
+
+    Args:
+        write: Serialize the call with all other writes in the owning process.
+            Reads are retried once after a dropped connection; writes are not.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        name = f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_remote():
+                if write:
+                    with _write_lock:
+                        return fn(*args, **kwargs)
+                return fn(*args, **kwargs)
+            with metrics.timed(f"store_{fn.__name__}"):
+                try:
+                    return (_proxy or connect()).call(name, args, kwargs)
+                except (EOFError, ConnectionError) as exc:
+                    _reset()
+                    if write:
+                        raise
+                    logger.warning("Store connection lost (%s), reconnecting", exc)
+                    return connect().call(name, args, kwargs)
+
+        _exported[name] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def serve() -> None:
+    """Load the model and Chroma collection, then serve routed calls forever."""
+    global _serving
+    authkey = _authkey()
+    _serving = True
+
+    from prometheus_client import start_http_server
+
+    # Importing the service modules registers their routed functions
+    # (refresh pulls in the catalog).
+    from app.services import embedder, refresh, snapshot
+
+    embedder._get_collection()
+    embedder._get_model()
+    snapshot.bootstrap_if_empty()
+
+    if settings.store_metrics_port:
+        start_http_server(settings.store_metrics_port)
+    if settings.refresh_enabled:
+        refresh.start()
+
+    store = _Store()
+    _ServerManager.register("store", callable=lambda: store, exposed=("call",))
+    address = _parse_address(settings.store_service_address or _DEFAULT_ADDRESS)
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)
+    server = _ServerManager(address=address, authkey=authkey).get_server()
+    logger.info(
+        "Store service listening on %s (%d functions exported)", address, len(_exported)
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+    # Re-import under the package name so routed functions and this entry point
+    # share one module-level registry instead of a separate `__main__` copy.
+    from app.services import store_service
+
+    store_service.serve()
@@ -0,0 +1,66 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare benchmarks/results/a1b2c3d.json benchmarks/results/latest.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# (section, field, higher_is_better)
+_TRACKED = [
+    ("upsert", "docs_per_second", True),
+    ("upsert", "python_peak_bytes", False),
+    ("vectors", "recall_at_5", True),
+    ("vectors", "disk_bytes", False),
+    ("vectors", "rss_bytes", False),
+    ("search_context", "p50_ms", False),
+    ("search_context", "p99_ms", False),
+    ("list_products", "p50_ms", False),
+    ("chat", "p50_ms", False),
+    ("chat", "p99_ms", False),
+]
+
+
+def _by_size(report: dict) -> dict[int, dict]:
+    return {r["size"]: r for r in report["results"]}
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list[str]:
+    """Return human-readable regression lines worse than `threshold` (relative)."""
+    regressions: list[str] = []
+    base, cand = _by_size(baseline), _by_size(candidate)
+    for size in sorted(base.keys() & cand.keys()):
+        for section, field, higher_is_better in _TRACKED:
+            old = base[size].get(section, {}).get(field)
+            new = cand[size].get(section, {}).get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            marker = "REGRESSION" if worse > threshold else "ok"
+            metric = f"{section}.{field}"
+            line = f"size={size:<7} {metric:<30} {old:>12.2f} -> {new:>12.2f} ({change:+.1%}) {marker}"
+            print(line)
+            if worse > threshold:
+                regressions.append(line)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown.")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    regressions = compare(baseline, candidate, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
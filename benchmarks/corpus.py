@@ -0,0 +1,78 @@
+"""Deterministic synthetic Turkish review corpora for benchmarks."""
+
+import random
+
+from app.services.scraper import ScrapedProduct
+
+_CATEGORIES = ["Elektronik", "Giyim", "Ev & Yaşam", "Kozmetik", "Spor", "Kitap"]
+_PRODUCT_NOUNS = [
+    "Kablosuz Kulaklık", "Akıllı Saat", "Pamuklu Tişört", "Kot Pantolon", "Kahve Makinesi",
+    "Nemlendirici Krem", "Koşu Ayakkabısı", "Yoga Matı", "Blender", "Sırt Çantası",
+]
+_BRANDS = ["Arçelik", "Vestel", "Koton", "LC Waikiki", "Karaca", "Flo", "Defacto", "Xiaomi"]
+
+_OPENINGS = [
+    "Ürün elime ulaştı,", "Siparişim beklediğimden hızlı geldi,", "İkinci kez alıyorum,",
+    "Hediye olarak aldım,", "Uzun süre araştırdıktan sonra aldım,", "Kargo biraz gecikti ama",
+]
+_BODIES = [
+    "kalitesi fiyatına göre gayet iyi.", "paketleme çok özenliydi.",
+    "rengi fotoğraftakinden biraz farklı.", "bedeni tam oldu, kumaşı yumuşak.",
+    "pil ömrü beklediğimden kısa.", "kurulumu çok kolaydı.", "sesi biraz yüksek çalışıyor.",
+    "kokusu hafif ve kalıcı.", "dikişlerinde sorun vardı.", "ilk yıkamada çekmedi.",
+]
+_CLOSINGS = [
+    "Tavsiye ederim.", "Teşekkürler.", "Bir yıldız kargo yüzünden eksik.",
+    "İade etmeyi düşünüyorum.", "Satıcıya teşekkürler, çok ilgililer.", "Fiyat performans ürünü.",
+    "",
+]
+
+
+def _review(rng: random.Random) -> str:
+    parts = [rng.choice(_OPENINGS), rng.choice(_BODIES)]
+    if rng.random() < 0.5:
+        parts.append(rng.choice(_BODIES))
+    parts.append(rng.choice(_CLOSINGS))
+    return " ".join(p for p in parts if p)
+
+
+def generate_products(
+    total_reviews: int, reviews_per_product: int = 50, seed: int = 42
+) -> list[ScrapedProduct]:
+    """
+    Build a reproducible set of products whose reviews add up to `total_reviews`.
+
+    Args:
+        total_reviews: Number of reviews across all products.
+        reviews_per_product: Reviews per product (last product may have fewer).
+        seed: RNG seed; the same arguments always yield the same corpus.
+
+    Returns:
+        List of ScrapedProduct objects ready for `embedder.upsert_product`.
+    """
+    rng = random.Random(seed)
+    products: list[ScrapedProduct] = []
+    remaining = total_reviews
+    idx = 0
+    while remaining > 0:
+        count = min(reviews_per_product, remaining)
+        noun = rng.choice(_PRODUCT_NOUNS)
+        brand = rng.choice(_BRANDS)
+        products.append(
+            ScrapedProduct(
+                product_id=f"bench{idx:06d}",
+                product_name=f"{brand} {noun}",
+                category=rng.choice(_CATEGORIES),
+                description=f"{brand} {noun}. {rng.choice(_BODIES).capitalize()}",
+                reviews=[_review(rng) for _ in range(count)],
+            )
+        )
+        remaining -= count
+        idx += 1
+    return products
+
+
+def generate_queries(count: int, seed: int = 7) -> list[str]:
+    """Build `count` incoming review texts used as /chat and search queries."""
+    rng = random.Random(seed)
+    return [_review(rng) for _ in range(count)]
@@ -0,0 +1,276 @@
+"""
+Benchmark the ingestion and /chat hot paths on synthetic Turkish corpora.
+
+    python -m benchmarks.run --sizes 500,5000,20000 --output benchmarks/results/latest.json
+
+Runs fully offline: Chroma lives in a temporary directory per corpus size, the
+Anthropic API is replaced by a local stub server, and the embedding model is
+loaded from the local Hugging Face cache (or replaced by `--hash-encoder`).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.stub_anthropic import StubAnthropicServer
+
+EMBEDDING_DIM = 384
+
+
+class HashEncoder:
+    """Deterministic stand-in for SentenceTransformer when model weights are unavailable."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def encode(self, sentences: list[str], show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        out = np.empty((len(sentences), self.dim), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            digest = hashlib.blake2b(sentence.encode("utf-8"), digest_size=8).digest()
+            out[i] = np.random.default_rng(int.from_bytes(digest, "little")).standard_normal(self.dim)
+        out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
+
+
+def _summary(samples: list[float]) -> dict:
+    arr = np.asarray(samples) * 1000
+    return {
+        "count": len(samples),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+    }
+
+
+def _timed_call(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _recall_at_k(embedder, pairs: list[tuple[str, str]], k: int = 5) -> float:
+    """Mean overlap of search_context with an exact float32 brute-force top-k."""
+    collection = embedder._get_collection()
+    model = embedder._get_model()
+    exact_cache: dict[str, tuple[np.ndarray, list[str]]] = {}
+    hits = 0
+    total = 0
+    for product_id, query in pairs:
+        if product_id not in exact_cache:
+            got = collection.get(where={"product_id": product_id}, include=["embeddings", "documents"])
+            vectors = np.asarray(got["embeddings"], dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            exact_cache[product_id] = (vectors, got["documents"])
+        vectors, documents = exact_cache[product_id]
+        q = np.asarray(model.encode([query], show_progress_bar=False), dtype=np.float32)[0]
+        q /= np.linalg.norm(q)
+        expected = {documents[i] for i in np.argsort(-(vectors @ q))[:k]}
+        found = set(embedder.search_context(product_id, query, top_k=k))
+        hits += len(expected & found)
+        total += len(expected)
+    return hits / total if total else 0.0
+
+
+def _dir_bytes(path: Path) -> int:
+    """Total size of all files under `path`."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _rss_bytes() -> int:
+    """Current resident set size; falls back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _bench_size(size: int, args: argparse.Namespace, queries: list[str]) -> dict:
+    from fastapi.testclient import TestClient
+
+    from app.config import settings
+    from app.main import app
+    from app.services import catalog, claude_client, embedder
+    from benchmarks import corpus
+
+    chroma_dir = tempfile.mkdtemp(prefix=f"trendyol-bench-{size}-")
+    settings.chroma_path = chroma_dir
+    settings.embedding_storage = args.storage
+    embedder._client = None
+    embedder._collection = None
+    embedder._index = None
+    catalog._db = None
+    # Measure the /chat hot path, not the tier rate limiter queueing requests.
+    settings.anthropic_requests_per_minute = 0
+    settings.anthropic_input_tokens_per_minute = 0
+    settings.anthropic_output_tokens_per_minute = 0
+    settings.anthropic_max_concurrency = 0
+    claude_client._buckets = None
+    claude_client._slots = None
+    try:
+        products = corpus.generate_products(size, args.reviews_per_product, seed=args.seed)
+        rng = random.Random(args.seed)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        documents = sum(embedder.upsert_product(p) for p in products)
+        upsert_seconds = time.perf_counter() - start
+        _, upsert_peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for query in queries[: args.warmup]:
+            embedder.search_context(rng.choice(products).product_id, query)
+        pairs = [(rng.choice(products).product_id, q) for q in queries]
+        search = [_timed_call(embedder.search_context, pid, q, top_k=5) for pid, q in pairs]
+        recall = _recall_at_k(embedder, pairs[: args.recall_queries])
+
+        # Quantized storage adds its index next to Chroma's float32 vectors and
+        # HNSW graph, so the footprint is the whole chroma_path, quantized/ included.
+        index = embedder._get_index()
+        index_dir = Path(chroma_dir) / "quantized"
+        vectors = {
+            "storage": args.storage,
+            "disk_bytes": _dir_bytes(Path(chroma_dir)),
+            "quantized_disk_bytes": _dir_bytes(index_dir) if index_dir.exists() else 0,
+            "quantized_loaded_bytes": index.nbytes if index is not None else 0,
+            "rss_bytes": _rss_bytes(),
+            "recall_at_5": round(recall, 4),
+        }
+
+        list_products = [_timed_call(embedder.list_products) for _ in range(args.list_repeats)]
+
+        client = TestClient(app)
+        chat = []
+        for query in queries[: args.chat_requests]:
+            payload = {"product_id": rng.choice(products).product_id, "review_text": query}
+            start = time.perf_counter()
+            response = client.post("/chat", json=payload)
+            chat.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+        return {
+            "size": size,
+            "products": len(products),
+            "documents": documents,
+            "upsert": {
+                "seconds": round(upsert_seconds, 3),
+                "docs_per_second": round(documents / upsert_seconds, 1),
+                "python_peak_bytes": upsert_peak_bytes,
+            },
+            "vectors": vectors,
+            "search_context": _summary(search),
+            "list_products": _summary(list_products),
+            "chat": _summary(chat),
+        }
+    finally:
+        embedder._client = None
+        embedder._collection = None
+        embedder._index = None
+        if catalog._db is not None:
+            catalog._db.close()
+            catalog._db = None
+        shutil.rmtree(chroma_dir, ignore_errors=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="500,5000", help="Comma-separated total review counts.")
+    parser.add_argument("--reviews-per-product", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200, help="search_context calls per size.")
+    parser.add_argument("--chat-requests", type=int, default=50, help="/chat calls per size.")
+    parser.add_argument("--list-repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Stub API delay.")
+    parser.add_argument("--hash-encoder", action="store_true", help="Skip the real model.")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads.")
+    parser.add_argument("--recall-queries", type=int, default=100, help="Queries scored for recall@5.")
+    parser.add_argument(
+        "--storage", choices=["float32", "float16", "int8"], default="float32",
+        help="Embedding storage mode (see EMBEDDING_STORAGE).",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    with StubAnthropicServer(latency_seconds=args.llm_latency_ms / 1000) as stub:
+        # Settings are read at import time, so the environment must be in place first.
+        os.environ["ANTHROPIC_API_KEY"] = "benchmark"
+        os.environ["ANTHROPIC_BASE_URL"] = stub.base_url
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+        import app.main  # noqa: F401 — configures logging; quieten it for the run
+        from app.services import embedder
+        from benchmarks import corpus
+
+        logging.getLogger().setLevel(logging.WARNING)
+        if args.hash_encoder:
+            embedder._model = HashEncoder()
+        encoder = "hash" if args.hash_encoder else embedder.EMBEDDING_MODEL
+
+        threads = None
+        if not args.hash_encoder:
+            import torch
+
+            if args.threads:
+                torch.set_num_threads(args.threads)
+            threads = torch.get_num_threads()
+            embedder._get_model()
+
+        queries = corpus.generate_queries(args.queries, seed=args.seed + 1)
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        results = []
+        for size in sizes:
+            print(f"Benchmarking corpus of {size} reviews...", file=sys.stderr)
+            results.append(_bench_size(size, args, queries))
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "torch_threads": threads,
+            "encoder": encoder,
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+
+    output = args.output or Path(__file__).parent / "results" / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Wrote {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
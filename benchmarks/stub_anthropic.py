@@ -0,0 +1,68 @@
+"""Minimal local stand-in for the Anthropic Messages API."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_REPLY = (
+    "Değerli müşterimiz, geri bildiriminiz için teşekkür ederiz. "
+    "Yaşadığınız deneyimi ekibimizle paylaştık ve en kısa sürede size dönüş yapacağız."
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency_seconds = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+        prompt_chars = len(payload.get("system", "")) + sum(
+            len(str(m.get("content", ""))) for m in payload.get("messages", [])
+        )
+        body = json.dumps(
+            {
+                "id": "msg_benchmark",
+                "type": "message",
+                "role": "assistant",
+                "model": payload.get("model", "stub"),
+                "content": [{"type": "text", "text": _REPLY}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": prompt_chars // 4, "output_tokens": len(_REPLY) // 4},
+            }
+        ).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAnthropicServer:
+    """Serve canned Messages API responses on 127.0.0.1 in a background thread."""
+
+    def __init__(self, latency_seconds: float = 0.0):
+        handler = type("Handler", (_Handler,), {"latency_seconds": latency_seconds})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubAnthropicServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,14 @@
+import pytest
+
+from app.config import settings
+from app.services import catalog
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """Keep on-disk state (catalog, quantized index) out of the working tree."""
+    monkeypatch.setattr(settings, "chroma_path", str(tmp_path / "chroma_db"))
+    monkeypatch.setattr(catalog, "_db", None)
+    yield
+    if catalog._db is not None:
+        catalog._db.close()
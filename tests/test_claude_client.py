@@ -0,0 +1,132 @@
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import claude_client
+from app.services.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _status_error(status: int) -> anthropic.APIStatusError:
+    response = httpx.Response(status, request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+    return anthropic.APIStatusError("error", response=response, body=None)
+
+
+def _message(text: str = "Teşekkürler.") -> MagicMock:
+    message = MagicMock()
+    message.content = [MagicMock(text=text)]
+    message.usage.input_tokens = 100
+    message.usage.output_tokens = 20
+    return message
+
+
+class TestTokenBucket:
+    def test_acquire_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2.0, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire(2) == 0.0
+        waited = bucket.acquire(1)
+        assert waited == pytest.approx(1.0)
+
+    def test_acquire_times_out(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=1.0, clock=clock, sleep=clock.sleep)
+        bucket.acquire(1)
+
+        with pytest.raises(TimeoutError):
+            bucket.acquire(1, timeout=0.5)
+
+    def test_negative_credit_delays_next_caller(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=10.0, clock=clock, sleep=clock.sleep)
+        bucket.credit(-5)
+
+        assert bucket.try_acquire(10) == pytest.approx(5.0)
+
+
+def test_limits_are_split_across_worker_processes():
+    with patch.object(claude_client.settings, "store_service_address", "/run/store/store.sock"), \
+            patch.object(claude_client.settings, "api_workers", 4), \
+            patch.object(claude_client.settings, "anthropic_requests_per_minute", 50), \
+            patch.object(claude_client.settings, "anthropic_max_concurrency", 8), \
+            patch.object(claude_client, "_buckets", None), \
+            patch.object(claude_client, "_slots", None):
+        assert claude_client._get_buckets()["requests"].capacity == pytest.approx(10.0)
+        slots = claude_client._get_slots()
+        assert slots.acquire(blocking=False)
+        assert not slots.acquire(blocking=False)
+
+
+class TestGenerateReply:
+    @patch("app.services.claude_client.time.sleep")
+    @patch("app.services.claude_client._get_buckets", return_value={})
+    @patch("app.services.claude_client._get_client")
+    def test_retries_on_rate_limit(self, mock_client, _buckets, mock_sleep):
+        mock_client.return_value.messages.create.side_effect = [
+            _status_error(429),
+            _status_error(529),
+            _message("Merhaba"),
+        ]
+
+        reply = claude_client.generate_reply("Ürün", "Genel", "Güzel ürün", [])
+
+        assert reply == "Merhaba"
+        assert mock_client.return_value.messages.create.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("app.services.claude_client.time.sleep")
+    @patch("app.services.claude_client._get_buckets", return_value={})
+    @patch("app.services.claude_client._get_client")
+    def test_does_not_retry_other_errors(self, mock_client, _buckets, mock_sleep):
+        mock_client.return_value.messages.create.side_effect = _status_error(400)
+
+        with pytest.raises(anthropic.APIStatusError):
+            claude_client.generate_reply("Ürün", "Genel", "Güzel ürün", [])
+
+        mock_sleep.assert_not_called()
+
+    @patch("app.services.claude_client.time.sleep")
+    @patch("app.services.claude_client._get_buckets", return_value={})
+    @patch("app.services.claude_client._get_client")
+    def test_retries_on_connection_errors_and_5xx(self, mock_client, _buckets, mock_sleep):
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        mock_client.return_value.messages.create.side_effect = [
+            anthropic.APIConnectionError(request=request),
+            anthropic.APITimeoutError(request=request),
+            _status_error(500),
+            _message("Merhaba"),
+        ]
+
+        reply = claude_client.generate_reply("Ürün", "Genel", "Güzel ürün", [])
+
+        assert reply == "Merhaba"
+        assert mock_sleep.call_count == 3
+
+
+@patch("app.routers.chat.embedder.list_products")
+@patch("app.routers.chat.embedder.search_context")
+@patch("app.routers.chat.claude_client.generate_reply")
+def test_chat_returns_503_when_llm_busy(mock_reply, mock_search, mock_list):
+    mock_list.return_value = [{"product_id": "123", "product_name": "Test Ürün"}]
+    mock_search.return_value = []
+    mock_reply.side_effect = claude_client.LLMBusyError("busy")
+
+    response = TestClient(app).post("/chat", json={"product_id": "123", "review_text": "Güzel"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,101 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import catalog, drafts
+from app.services.scraper import ScrapedProduct
+
+client = TestClient(app)
+
+
+class _InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+def _product(reviews: list[str]) -> ScrapedProduct:
+    return ScrapedProduct(
+        product_id="123", product_name="Test Ürün", category="Elektronik", description="", reviews=reviews
+    )
+
+
+@patch("app.services.drafts._get_executor", return_value=_InlineExecutor())
+@patch("app.services.drafts.claude_client.generate_reply", return_value="Taslak yanıt")
+@patch("app.services.drafts.embedder.search_context", return_value=["Bağlam"])
+def test_schedule_drafts_newest_reviews_once(mock_search, mock_reply, _executor):
+    product = _product(["Yorum 1", "Yorum 2", "Yorum 3"])
+
+    with patch.object(drafts.settings, "drafts_per_product", 2):
+        assert drafts.schedule(product) == 2
+        assert drafts.schedule(product) == 0  # already drafted
+
+    stored = {d["review_text"]: d for d in catalog.get_drafts("123")}
+    assert set(stored) == {"Yorum 1", "Yorum 2"}
+    assert stored["Yorum 1"]["reply"] == "Taslak yanıt"
+    assert mock_reply.call_count == 2
+
+
+def test_invalidation_discards_drafts_started_before_it():
+    started_at = time.time()
+    catalog.save_draft("123", "Yorum", "Eski", 1, started_at)
+
+    catalog.invalidate_drafts("123")
+
+    assert catalog.get_drafts("123") == []
+    assert catalog.save_draft("123", "Yorum", "Eski", 1, started_at) is False
+    assert catalog.save_draft("123", "Yorum", "Yeni", 1, time.time() + 1) is True
+
+
+@patch("app.routers.chat.claude_client.generate_reply")
+def test_chat_serves_stored_draft(mock_reply):
+    catalog.save_draft("123", "Kargo geç geldi", "Özür dileriz.", 3, time.time())
+
+    response = client.post("/chat", json={"product_id": "123", "review_text": "Kargo geç geldi"})
+
+    assert response.status_code == 200
+    assert response.json()["generated_reply"] == "Özür dileriz."
+    assert response.json()["context_used"] == 3
+    mock_reply.assert_not_called()
+
+
+def test_drafts_endpoint():
+    catalog.save_draft("123", "Yorum", "Yanıt", 2, time.time())
+
+    listed = client.get("/drafts/123")
+    single = client.get("/drafts/123", params={"review_text": "Yorum"})
+    missing = client.get("/drafts/123", params={"review_text": "Başka"})
+
+    assert listed.json()[0]["generated_reply"] == "Yanıt"
+    assert single.json()[0]["review_text"] == "Yorum"
+    assert missing.status_code == 404
+
+
+def test_queue_bound_drops_excess_drafts():
+    executor = MagicMock()
+    with patch.object(drafts, "_get_executor", return_value=executor), \
+            patch.object(drafts.settings, "draft_queue_size", 1), \
+            patch.object(drafts, "_pending", 0):
+        assert drafts.schedule(_product(["A", "B", "C"])) == 1
+
+    executor.submit.assert_called_once()
+
+
+@patch("app.services.embedder._get_collection")
+@patch("app.services.embedder._get_model")
+def test_unchanged_rescrape_keeps_drafts(mock_model, mock_collection):
+    from app.services import embedder
+
+    product = _product(["Yorum 1", "Yorum 2"])
+    mock_model.return_value.encode.return_value = [[0.1, 0.2]] * 2
+    stored = {"ids": ["123_review_0", "123_review_1"], "documents": ["Yorum 1", "Yorum 2"]}
+    mock_collection.return_value.get.return_value = stored
+    catalog.save_draft("123", "Yorum 1", "Taslak", 1, time.time())
+
+    embedder.upsert_product(product)
+    assert len(catalog.get_drafts("123")) == 1
+
+    stored["documents"] = ["Yorum 1", "Eski yorum"]
+    embedder.upsert_product(product)
+    assert catalog.get_drafts("123") == []
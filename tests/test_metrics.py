@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.services import metrics
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "trendyol_http_request_duration_seconds" in response.text
+    assert "trendyol_stage_duration_seconds" in response.text
+
+
+@patch("app.routers.chat.embedder.list_products")
+@patch("app.routers.chat.embedder.search_context")
+@patch("app.routers.chat.claude_client.generate_reply")
+def test_chat_response_has_server_timing(mock_reply, mock_search, mock_list):
+    mock_list.return_value = [{"product_id": "123", "product_name": "Test Ürün"}]
+    mock_search.return_value = []
+    mock_reply.return_value = "Teşekkürler."
+
+    response = client.post("/chat", json={"product_id": "123", "review_text": "Güzel"})
+
+    server_timing = response.headers["Server-Timing"]
+    assert "product_lookup;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+
+@patch("app.routers.chat.embedder.list_products", side_effect=EOFError)
+def test_unhandled_error_is_recorded_as_500(_list):
+    labels = {"method": "POST", "route": "/chat", "status": "500"}
+    before = REGISTRY.get_sample_value("trendyol_http_request_duration_seconds_count", labels) or 0
+
+    response = TestClient(app, raise_server_exceptions=False).post(
+        "/chat", json={"product_id": "123", "review_text": "Güzel"}
+    )
+
+    assert response.status_code == 500
+    after = REGISTRY.get_sample_value("trendyol_http_request_duration_seconds_count", labels)
+    assert after == before + 1
+
+
+def test_timed_records_stage_outside_request():
+    with metrics.timed("unit_test_stage"):
+        pass
+
+    count = REGISTRY.get_sample_value(
+        "trendyol_stage_duration_seconds_count", {"stage": "unit_test_stage"}
+    )
+    assert count >= 1
+
+
+def test_format_server_timing():
+    header = metrics.format_server_timing([("embed", 0.0125), ("llm", 1.5)])
+    assert header == "embed;dur=12.5, llm;dur=1500.0"
@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.quantization import QuantizedIndex, quantize, rescore
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((20, 384)).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_quantize_preserves_cosine(vectors, dtype):
+    codes, scales = quantize(vectors, dtype)
+    restored = codes.astype(np.float32) * scales[:, None]
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    cosine = (restored * normalized).sum(axis=1) / np.linalg.norm(restored, axis=1)
+    assert cosine.min() > 0.999
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_index_search_finds_nearest_and_survives_reload(tmp_path, vectors, dtype):
+    ids = [f"p1_review_{i}" for i in range(len(vectors))]
+    index = QuantizedIndex(tmp_path, dtype)
+    index.upsert("p1", ids, vectors)
+
+    assert index.search("p1", vectors[7], k=3)[0] == "p1_review_7"
+    assert index.search("missing", vectors[7], k=3) is None
+
+    reloaded = QuantizedIndex(tmp_path, dtype)
+    assert reloaded.search("p1", vectors[3], k=1) == ["p1_review_3"]
+
+
+def test_index_upsert_replaces_existing_ids(tmp_path, vectors):
+    index = QuantizedIndex(tmp_path, "int8")
+    index.upsert("p1", ["a", "b"], vectors[:2])
+    index.upsert("p1", ["b", "c"], vectors[2:4])
+
+    assert sorted(index.search("p1", vectors[2], k=10)) == ["a", "b", "c"]
+    assert index.search("p1", vectors[2], k=1) == ["b"]
+
+
+def test_rescore_orders_by_exact_cosine(vectors):
+    assert rescore(vectors[5], vectors[[1, 5, 9]], k=1) == [1]
+
+
+@patch("app.services.embedder._get_collection")
+@patch("app.services.embedder._get_model")
+def test_search_context_rescores_quantized_candidates(mock_model, mock_collection, tmp_path, vectors):
+    from app.services import embedder
+
+    index = QuantizedIndex(tmp_path, "int8")
+    ids = [f"p1_review_{i}" for i in range(len(vectors))]
+    index.upsert("p1", ids, vectors)
+
+    mock_model.return_value.encode.return_value = vectors[[4]]
+    mock_coll = MagicMock()
+    mock_coll.get.side_effect = lambda ids, include: {
+        "embeddings": vectors[[int(i.rsplit("_", 1)[1]) for i in ids]],
+        "documents": [f"doc {i.rsplit('_', 1)[1]}" for i in ids],
+    }
+    mock_collection.return_value = mock_coll
+
+    with patch.object(embedder, "_get_index", return_value=index):
+        results = embedder.search_context("p1", "Kargo hızlıydı", top_k=2)
+
+    assert results[0] == "doc 4"
+    mock_coll.query.assert_not_called()
+
+
+@patch("app.services.embedder._get_collection")
+@patch("app.services.embedder._get_model")
+def test_new_index_entry_is_backfilled_from_chroma(mock_model, mock_collection, tmp_path, vectors):
+    from app.services import embedder
+    from app.services.scraper import ScrapedProduct
+
+    # Five reviews were stored before quantization was enabled; a refresh adds one.
+    stored_ids = [f"p1_review_{i}" for i in range(6)]
+    mock_model.return_value.encode.return_value = vectors[[5]]
+    mock_coll = MagicMock()
+    mock_coll.get.side_effect = lambda where, include: (
+        {"ids": stored_ids[:5], "documents": [f"doc {i}" for i in range(5)]}
+        if include == ["documents"]
+        else {"ids": stored_ids, "embeddings": vectors[:6]}
+    )
+    mock_collection.return_value = mock_coll
+    index = QuantizedIndex(tmp_path, "int8")
+    product = ScrapedProduct(
+        product_id="p1", product_name="Ürün", category="Genel", description="",
+        reviews=[f"doc {i}" for i in range(6)],
+    )
+
+    with patch.object(embedder, "_get_index", return_value=index):
+        assert embedder.upsert_product(product, incremental=True) == 1
+
+    assert sorted(index.search("p1", vectors[0], k=10)) == sorted(stored_ids)
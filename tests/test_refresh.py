@@ -0,0 +1,145 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import catalog, embedder, refresh
+from app.services.scraper import ScrapedProduct
+
+HOUR = 3600
+
+
+def _seed_catalog(now: float) -> None:
+    catalog.record_scrape("hot", "Sıcak Ürün", "Elektronik", "https://www.trendyol.com/a-p-1", now - 12 * HOUR)
+    catalog.record_scrape("cold", "Soğuk Ürün", "Giyim", "https://www.trendyol.com/b-p-2", now - 48 * HOUR)
+    catalog.record_scrape("fresh", "Yeni Ürün", "Kitap", "https://www.trendyol.com/c-p-3", now - 1 * HOUR)
+    for _ in range(5):
+        catalog.record_chat("hot", at=now)
+    catalog.record_chat("fresh", at=now)
+
+
+class TestSchedule:
+    def test_demand_outranks_staleness_and_cold_products_wait(self):
+        now = time.time()
+        _seed_catalog(now)
+
+        schedule = {e["product_id"]: e for e in refresh.compute_schedule(now)}
+        order = [e["product_id"] for e in refresh.compute_schedule(now)]
+
+        assert order[0] == "hot"
+        assert schedule["hot"]["due"]
+        assert not schedule["cold"]["due"]  # no demand, younger than refresh_max_age_hours
+        assert not schedule["fresh"]["due"]  # scraped too recently
+
+    def test_demand_decays(self):
+        assert catalog.decayed_demand(4.0, 0.0, 24 * HOUR) == 2.0
+        assert catalog.decayed_demand(0.0, None, 0.0) == 0.0
+
+    @patch("app.services.refresh.refresh_product")
+    def test_run_once_respects_scrape_budget(self, mock_refresh):
+        now = time.time()
+        _seed_catalog(now)
+        catalog.record_scrape("hot2", "Sıcak 2", "Spor", "https://www.trendyol.com/d-p-4", now - 30 * HOUR)
+        catalog.record_chat("hot2", at=now)
+
+        with patch.object(refresh.settings, "refresh_scrapes_per_hour", 1.0):
+            scheduler = refresh.RefreshScheduler()
+            refreshed = scheduler.run_once(now)
+
+        assert len(refreshed) == 1
+        mock_refresh.assert_called_once()
+
+    @patch("app.services.refresh.embedder.list_products")
+    def test_uncatalogued_products_are_reported(self, mock_list):
+        _seed_catalog(time.time())
+        mock_list.return_value = [
+            {"product_id": "hot", "product_name": "Sıcak Ürün"},
+            {"product_id": "legacy", "product_name": "Eski Ürün"},
+        ]
+
+        assert refresh.uncatalogued_products() == ["legacy"]
+
+    def test_admin_endpoint_lists_schedule(self):
+        _seed_catalog(time.time())
+
+        response = TestClient(app).get("/admin/refresh")
+
+        assert response.status_code == 200
+        assert response.json()["entries"][0]["product_id"] == "hot"
+
+
+@patch("app.routers.chat.catalog.record_chat", side_effect=EOFError)
+@patch("app.routers.chat.embedder.list_products")
+@patch("app.routers.chat.embedder.search_context", return_value=[])
+@patch("app.routers.chat.claude_client.generate_reply", return_value="Teşekkürler!")
+def test_chat_survives_demand_recording_failure(_reply, _search, mock_list, _record):
+    mock_list.return_value = [{"product_id": "123", "product_name": "Test Ürün"}]
+
+    response = TestClient(app).post("/chat", json={"product_id": "123", "review_text": "Güzel"})
+
+    assert response.status_code == 200
+
+
+@patch("app.services.embedder._get_collection")
+@patch("app.services.embedder._get_model")
+def test_incremental_upsert_embeds_only_new_reviews(mock_model, mock_collection):
+    from app.services.embedder import upsert_product
+
+    mock_coll = MagicMock()
+    mock_coll.get.return_value = {
+        "ids": ["p1_desc", "p1_review_0", "p1_review_1"],
+        "documents": ["Ürün: Test\nAçıklama", "Eski yorum 1", "Eski yorum 2"],
+    }
+    mock_collection.return_value = mock_coll
+    mock_model.return_value.encode.return_value = [[0.1, 0.2]]
+
+    product = ScrapedProduct(
+        product_id="p1",
+        product_name="Test",
+        category="Test",
+        description="Açıklama",
+        reviews=["Yeni yorum", "Eski yorum 1"],
+    )
+    count = upsert_product(product, incremental=True)
+
+    assert count == 1
+    kwargs = mock_coll.upsert.call_args.kwargs
+    assert kwargs["documents"] == ["Yeni yorum"]
+    assert kwargs["ids"] == ["p1_review_2"]
+
+
+class _TextEncoder:
+    """Deterministic per-text vectors, so the test needs no model weights."""
+
+    def encode(self, sentences, show_progress_bar=False):
+        return np.array(
+            [np.random.default_rng(sum(map(ord, s))).standard_normal(8) for s in sentences],
+            dtype=np.float32,
+        )
+
+
+def test_refresh_then_manual_rescrape_keeps_one_copy_per_review(monkeypatch):
+    monkeypatch.setattr(embedder, "_client", None)
+    monkeypatch.setattr(embedder, "_collection", None)
+    monkeypatch.setattr(embedder, "_index", None)
+
+    def product(reviews):
+        return ScrapedProduct(
+            product_id="p", product_name="Ürün", category="Genel", description="", reviews=reviews
+        )
+
+    with patch.object(embedder, "_get_model", return_value=_TextEncoder()):
+        embedder.upsert_product(product(["r0", "r1", "r2"]))
+        embedder.upsert_product(product(["yeni", "r0", "r1"]), incremental=True)
+        catalog.save_draft("p", "r0", "Taslak", 1, time.time())
+        embedder.upsert_product(product(["yeni", "r0", "r1"]))
+
+        stored = embedder._get_collection().get(where={"product_id": "p"})["documents"]
+        assert sorted(stored) == ["r0", "r1", "r2", "yeni"]
+        assert embedder.get_product_review_count("p") == 4
+        assert embedder.search_context("p", "yeni", top_k=4).count("yeni") == 1
+    # The manual re-scrape rewrote the same documents, so drafts survive.
+    assert len(catalog.get_drafts("p")) == 1
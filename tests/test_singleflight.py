@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "yanıt"
+
+    async def scenario():
+        group = SingleFlight("test")
+        results = await asyncio.gather(*(group.do("key", compute) for _ in range(5)))
+        return results, group.inflight
+
+    results, inflight = asyncio.run(scenario())
+    assert results == ["yanıt"] * 5
+    assert calls == 1
+    assert inflight == 0
+
+
+def test_different_keys_are_not_coalesced():
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    async def scenario():
+        group = SingleFlight("test")
+        return await asyncio.gather(group.do("a", lambda: compute("a")), group.do("b", lambda: compute("b")))
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_exception_is_shared_and_not_cached():
+    attempts = 0
+
+    async def failing():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        group = SingleFlight("test")
+        results = await asyncio.gather(
+            group.do("key", failing), group.do("key", failing), return_exceptions=True
+        )
+        with pytest.raises(ValueError):
+            await group.do("key", failing)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert attempts == 2
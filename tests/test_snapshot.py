@@ -0,0 +1,96 @@
+import json
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services import catalog, snapshot
+
+
+class FakeCollection:
+    """In-memory stand-in for the parts of chromadb.Collection used by snapshots."""
+
+    def __init__(self):
+        self.records: dict[str, tuple[np.ndarray, str, dict]] = {}
+
+    def count(self) -> int:
+        return len(self.records)
+
+    def get(self, offset: int, limit: int, include: list[str]) -> dict:
+        ids = sorted(self.records)[offset: offset + limit]
+        return {
+            "ids": ids,
+            "embeddings": np.array([self.records[i][0] for i in ids]),
+            "documents": [self.records[i][1] for i in ids],
+            "metadatas": [self.records[i][2] for i in ids],
+        }
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        for doc_id, emb, doc, meta in zip(ids, embeddings, documents, metadatas):
+            self.records[doc_id] = (np.asarray(emb), doc, meta)
+
+
+@pytest.fixture
+def source():
+    rng = np.random.default_rng(1)
+    coll = FakeCollection()
+    coll.upsert(
+        ids=[f"p{i % 3}_review_{i}" for i in range(7)],
+        embeddings=rng.standard_normal((7, 8)).astype(np.float32),
+        documents=[f"Yorum {i} çok güzel" for i in range(7)],
+        metadatas=[{"product_id": f"p{i % 3}", "type": "review"} for i in range(7)],
+    )
+    return coll
+
+
+def test_export_import_roundtrip(tmp_path, source):
+    catalog.record_scrape("p0", "Ürün", "Genel", "https://www.trendyol.com/x-p-0")
+    catalog.save_draft("p0", "Yorum 0 çok güzel", "Teşekkürler", 2, time.time())
+
+    with patch("app.services.embedder._get_collection", return_value=source):
+        manifest = snapshot.export_snapshot(tmp_path / "snap", chunk_size=3)
+
+    assert manifest["count"] == 7
+    assert len(manifest["chunks"]) == 3
+
+    # Fresh replica: empty collection and empty catalog.
+    target = FakeCollection()
+    catalog._db.close()
+    catalog._db = None
+    with patch.object(catalog.settings, "chroma_path", str(tmp_path / "replica")), \
+            patch("app.services.embedder._get_collection", return_value=target):
+        assert snapshot.import_snapshot(tmp_path / "snap") == 7
+        assert catalog.get_draft("p0", "Yorum 0 çok güzel")["reply"] == "Teşekkürler"
+
+    assert target.records.keys() == source.records.keys()
+    for doc_id, (emb, doc, meta) in source.records.items():
+        np.testing.assert_array_equal(target.records[doc_id][0], emb)
+        assert target.records[doc_id][1:] == (doc, meta)
+
+
+def test_import_rejects_corrupted_chunk(tmp_path, source):
+    with patch("app.services.embedder._get_collection", return_value=source):
+        manifest = snapshot.export_snapshot(tmp_path / "snap", chunk_size=10)
+    (tmp_path / "snap" / manifest["chunks"][0]["file"]).write_bytes(b"bozuk")
+
+    with pytest.raises(ValueError, match="Checksum"):
+        snapshot.import_snapshot(tmp_path / "snap")
+
+
+def test_import_rejects_other_embedding_model(tmp_path, source):
+    with patch("app.services.embedder._get_collection", return_value=source):
+        snapshot.export_snapshot(tmp_path / "snap")
+    manifest_path = tmp_path / "snap" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text())
+    manifest["embedding_model"] = "another/model"
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError, match="another/model"):
+        snapshot.import_snapshot(tmp_path / "snap")
+
+
+def test_bootstrap_skips_populated_store(source):
+    with patch.object(snapshot.settings, "snapshot_bootstrap_path", "/does/not/exist"), \
+            patch("app.services.embedder._get_collection", return_value=source):
+        assert snapshot.bootstrap_if_empty() == 0
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import store_service
+
+
+@store_service.routed()
+def _echo(value):
+    return f"local:{value}"
+
+
+@store_service.routed(write=True)
+def _write(value):
+    return f"written:{value}"
+
+
+class TestRouted:
+    def test_runs_locally_without_address(self):
+        with patch.object(store_service.settings, "store_service_address", ""):
+            assert _echo("x") == "local:x"
+
+    def test_forwards_to_store_service_when_configured(self):
+        proxy = MagicMock()
+        proxy.call.return_value = "remote:x"
+        with patch.object(store_service.settings, "store_service_address", "store:50051"), \
+                patch.object(store_service, "_proxy", proxy):
+            assert _echo("x") == "remote:x"
+
+        proxy.call.assert_called_once_with(f"{__name__}._echo", ("x",), {})
+
+    def test_read_reconnects_after_dropped_connection(self):
+        broken, fresh = MagicMock(), MagicMock()
+        broken.call.side_effect = EOFError
+        fresh.call.return_value = "remote:x"
+        with patch.object(store_service.settings, "store_service_address", "store:50051"), \
+                patch.object(store_service, "_proxy", broken), \
+                patch.object(store_service, "connect", return_value=fresh):
+            assert _echo("x") == "remote:x"
+
+
+def test_store_executes_exported_functions():
+    store = store_service._Store()
+    assert store.call(f"{__name__}._write", ("x",), {}) == "written:x"
+
+
+def test_parse_address():
+    assert store_service._parse_address("store:50051") == ("store", 50051)
+    assert store_service._parse_address("/tmp/store.sock") == "/tmp/store.sock"
+
+
+@pytest.mark.parametrize("authkey", ["", "trendyol-store"])
+def test_serve_refuses_missing_or_default_authkey(authkey):
+    with patch.object(store_service.settings, "store_service_authkey", authkey), \
+            patch.object(store_service, "_ServerManager") as manager:
+        with pytest.raises(RuntimeError, match="STORE_SERVICE_AUTHKEY"):
+            store_service.serve()
+
+    manager.assert_not_called()
+    assert store_service._serving is False